@@ -0,0 +1,105 @@
+"""
+Import-time budget check for fastfingertips.
+
+Runs each import in a fresh interpreter with ``python -X importtime``,
+sums the time spent on modules that a bare interpreter does not already
+load, and fails when an import exceeds its budget or pulls in a heavy
+third-party dependency it should defer.
+
+Usage:
+    python benchmarks/import_time.py [--runs N] [--scale FACTOR] [--json PATH]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import statement -> budget in milliseconds (best of several runs). Budgets
+# leave room for stdlib imports; pulling in requests or bs4 alone costs more.
+BUDGETS_MS = {
+    "import fastfingertips": 10,
+    "import fastfingertips.string_utils": 30,
+    "import fastfingertips.url_utils": 30,
+    "import fastfingertips.datetime_utils": 40,
+    "import fastfingertips.file_utils": 30,
+    "import fastfingertips.terminal_utils": 15,
+    "import fastfingertips.bs4_utils": 40,
+    "import fastfingertips.arrow_utils": 40,
+    "from fastfingertips import slugify, parse_datetime": 50,
+}
+
+# Third-party modules that must only be imported on first use
+HEAVY_MODULES = ("requests", "bs4", "termcolor", "PIL", "pyarrow")
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True,
+    )
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    """Map each imported module to its self time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line.split("|")
+        try:
+            self_us = int(parts[0].split(":")[1])
+        except ValueError:
+            continue  # header line
+        modules[parts[2].strip()] = self_us
+    return modules
+
+
+def measure(statement: str, baseline: set[str], runs: int) -> tuple[float, list[str]]:
+    """Return the best import time in ms and the heavy modules loaded by the statement."""
+    best = None
+    heavy = []
+    probe = f"{statement}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    for _ in range(runs):
+        result = _run(probe)
+        modules = _parse_importtime(result.stderr)
+        total_us = sum(us for name, us in modules.items() if name not in baseline)
+        best = total_us if best is None else min(best, total_us)
+        heavy = [name for name in result.stdout.strip().split(",") if name]
+    return best / 1000, heavy
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="runs per import, best is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, for slow machines")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    baseline = set(_parse_importtime(_run("pass").stderr))
+
+    results = []
+    failed = False
+    for statement, budget_ms in BUDGETS_MS.items():
+        elapsed_ms, heavy = measure(statement, baseline, args.runs)
+        budget_ms *= args.scale
+        ok = elapsed_ms <= budget_ms and not heavy
+        failed |= not ok
+        results.append({"statement": statement, "ms": round(elapsed_ms, 3), "budget_ms": budget_ms, "heavy": heavy, "ok": ok})
+        status = "ok" if ok else "FAIL"
+        extra = f"  (loaded {', '.join(heavy)})" if heavy else ""
+        print(f"{status:4}  {elapsed_ms:7.2f} ms / {budget_ms:6.1f} ms  {statement}{extra}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,433 @@
+"""
+Micro-benchmarks for the fastfingertips utility functions.
+
+Every case runs one public function over a generated dataset (seeded, so
+runs are comparable) at several sizes and reports the best time per item
+over several repeats. Results can be written as JSON, saved as a baseline
+and compared against one; a case regresses when it is slower than the
+baseline by more than its threshold.
+
+Usage:
+    python benchmarks/micro.py [--sizes 100,1000,10000] [--repeat N] [--filter TEXT]
+                               [--json PATH] [--save-baseline PATH]
+                               [--baseline PATH] [--threshold FRACTION]
+
+Public functions of the covered modules that have no case are listed as
+uncovered (an error with --strict), so new functions get a benchmark.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fastfingertips  # noqa: E402
+from fastfingertips import concurrency_utils, datetime_utils, file_utils, string_utils, url_utils  # noqa: E402
+
+COVERED_MODULES = (string_utils, url_utils, datetime_utils, file_utils, concurrency_utils)
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_THRESHOLD = 0.20
+
+# Per-case regression thresholds for cases that are noisier than the default
+THRESHOLDS = {
+    "concurrency_utils.run_parallel": 0.50,
+    "concurrency_utils.to_async": 0.50,
+    "string_utils.scan_file": 0.35,
+    "url_utils.scan_urls": 0.35,
+    "datetime_utils.now": 0.35,
+    "datetime_utils.today": 0.35,
+    "datetime_utils.get_timestamp": 0.35,
+}
+
+SEED = 20240101
+MIN_RUN_SECONDS = 0.05
+
+WORDS = [
+    "the", "a", "of", "night", "garden", "river", "empire", "shadow", "python", "data",
+    "Café", "naïve", "Über", "señor", "crème", "brûlée", "tale", "two", "cities", "war",
+    "peace", "book", "light", "code", "clean", "pragmatic", "programmer", "design", "patterns",
+]
+DOMAINS = ["example.com", "books.toscrape.com", "letterboxd.com", "kitapyurdu.com", "site.org"]
+DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y",
+    "%Y/%m/%d", "%d.%m.%Y", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S",
+]
+
+
+# Dataset generators. Each takes a seeded Random and a size.
+
+def gen_titles(rng: random.Random, size: int) -> list[str]:
+    punctuation = ["", ",", ":", " -", "!", "?", " (2nd Edition)", "  "]
+    return [
+        " ".join(rng.choice(WORDS) + rng.choice(punctuation) for _ in range(rng.randint(2, 8)))
+        for _ in range(size)
+    ]
+
+
+def gen_texts(rng: random.Random, size: int) -> list[str]:
+    texts = []
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.4:
+            texts.append(f"Published in {rng.randint(1850, 2040)} by {rng.choice(WORDS)} press")
+        elif kind < 0.7:
+            texts.append(f"{rng.randint(1, 999)},{rng.randint(100, 999)} readers · {rng.randint(1, 99)} reviews")
+        elif kind < 0.85:
+            texts.append("   " + "  \t".join(rng.choices(WORDS, k=6)) + "\n ")
+        else:
+            texts.append("".join(rng.choices(string.ascii_letters + " ", k=rng.randint(0, 40))))
+    return texts
+
+
+def gen_emails(rng: random.Random, size: int) -> list[str]:
+    emails = []
+    for _ in range(size):
+        user = "".join(rng.choices(string.ascii_lowercase + "._-", k=rng.randint(1, 12)))
+        kind = rng.random()
+        if kind < 0.6:
+            emails.append(f"{user}@{rng.choice(DOMAINS)}")
+        elif kind < 0.8:
+            emails.append(f"{user}.{rng.choice(DOMAINS)}")
+        else:
+            emails.append(rng.choice(["", "@", "user@", "user@host", "a b@c.d"]))
+    return emails
+
+
+def gen_urls(rng: random.Random, size: int) -> list[str]:
+    urls = []
+    for _ in range(size):
+        kind = rng.random()
+        path = "/".join(rng.choice(["film", "user", "list", "books", "p"]) + str(rng.randint(0, 999))
+                        for _ in range(rng.randint(0, 4)))
+        if kind < 0.7:
+            query = f"?page={rng.randint(1, 50)}" if rng.random() < 0.3 else ""
+            slash = "/" if rng.random() < 0.5 else ""
+            urls.append(f"{rng.choice(['http', 'https'])}://{rng.choice(DOMAINS)}/{path}{slash}{query}")
+        elif kind < 0.85:
+            urls.append(f"ftp://{rng.choice(DOMAINS)}/{path}")
+        else:
+            urls.append(rng.choice(["", "not a url", "www.example.com", "https://", " https://example.com "]))
+    return urls
+
+
+def gen_datetimes(rng: random.Random, size: int) -> list[datetime]:
+    start = datetime(2000, 1, 1)
+    return [start + timedelta(seconds=rng.randint(0, 25 * 365 * 86400), microseconds=rng.randint(0, 999999))
+            for _ in range(size)]
+
+
+def gen_date_strings(rng: random.Random, size: int) -> list[str]:
+    strings = []
+    for dt in gen_datetimes(rng, size):
+        if rng.random() < 0.1:
+            strings.append(rng.choice(["", "yesterday", "2025-13-45", "32/01/2020"]))
+        else:
+            strings.append(dt.strftime(rng.choice(DATE_FORMATS)))
+    return strings
+
+
+def gen_mixed_dates(rng: random.Random, size: int) -> list:
+    strings = gen_date_strings(rng, size)
+    datetimes = gen_datetimes(rng, size)
+    return [rng.choice((strings[i], datetimes[i], None)) for i in range(size)]
+
+
+def gen_rows(rng: random.Random, size: int) -> list[dict]:
+    titles = gen_titles(rng, size)
+    return [
+        {"id": i, "title": titles[i], "price": round(rng.uniform(1, 200), 2),
+         "url": f"https://{rng.choice(DOMAINS)}/p/{i}", "stock": rng.randint(0, 50)}
+        for i in range(size)
+    ]
+
+
+def _repeated(items: list, rng: random.Random, distinct: int = 50) -> list:
+    """Draw from a small pool so memoized variants see mostly repeated inputs."""
+    pool = items[:distinct]
+    return [rng.choice(pool) for _ in items]
+
+
+def _scan_text(rng: random.Random, size: int) -> str:
+    parts = []
+    for text, url, email in zip(gen_texts(rng, size), gen_urls(rng, size), gen_emails(rng, size)):
+        parts.append(f"<p>{text} <a href=\"{url}\">{email}</a></p>\n")
+    return "".join(parts)
+
+
+# Cases: name -> (setup(rng, size, workdir) -> data, run(data)). `run`
+# processes the whole dataset once; time is reported per item.
+
+def _map(func):
+    def run(data):
+        for item in data:
+            func(item)
+    return run
+
+
+def _star(func):
+    def run(data):
+        for args in data:
+            func(*args)
+    return run
+
+
+def _repeat_call(func):
+    def run(count):
+        for _ in range(count):
+            func()
+    return run
+
+
+async def _async_abs(value):
+    return abs(value)
+
+
+async def _drain(async_iterator):
+    async for _ in async_iterator:
+        pass
+
+
+def _write_scan_file(rng, size, workdir):
+    path = os.path.join(workdir, f"scan_{size}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_scan_text(rng, size))
+    return path
+
+
+def _write_jsonl_file(rng, size, workdir):
+    path = os.path.join(workdir, f"rows_{size}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(row) + "\n" for row in gen_rows(rng, size))
+    return path
+
+
+def _rebuild_index(path):
+    index_path = path + file_utils.INDEX_SUFFIX
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    file_utils.build_index(path, key="id")
+
+
+def _open_indexed_reader(rng, size, workdir):
+    path = os.path.join(workdir, f"indexed_{size}.jsonl")
+    file_utils.write_indexed(path, gen_rows(rng, size), key="id")
+    return file_utils.IndexedReader(path), [rng.randrange(size) for _ in range(size)]
+
+
+def _pairs(gen):
+    def setup(rng, size, workdir):
+        first, second = gen(rng, size), gen(rng, size)
+        return list(zip(first, second))
+    return setup
+
+
+su, uu, du, fu, cu = string_utils, url_utils, datetime_utils, file_utils, concurrency_utils
+
+CASES = {
+    # string_utils
+    "string_utils.extract_pattern": (lambda rng, n, w: [(t, r"(\d{4})") for t in gen_texts(rng, n)], _star(su.extract_pattern)),
+    "string_utils.extract_year": (lambda rng, n, w: gen_texts(rng, n), _map(su.extract_year)),
+    "string_utils.extract_year_cached": (lambda rng, n, w: _repeated(gen_texts(rng, n), rng), _map(su.extract_year_cached)),
+    "string_utils.extract_number_from_text": (lambda rng, n, w: gen_texts(rng, n), _map(su.extract_number_from_text)),
+    "string_utils.clean_whitespace": (lambda rng, n, w: gen_texts(rng, n), _map(su.clean_whitespace)),
+    "string_utils.slugify": (lambda rng, n, w: gen_titles(rng, n), _map(su.slugify)),
+    "string_utils.slugify_cached": (lambda rng, n, w: _repeated(gen_titles(rng, n), rng), _map(su.slugify_cached)),
+    "string_utils.is_valid_email": (lambda rng, n, w: gen_emails(rng, n), _map(su.is_valid_email)),
+    "string_utils.is_boolean": (lambda rng, n, w: [rng.choice((True, 0, "true", None)) for _ in range(n)], _map(su.is_boolean)),
+    "string_utils.is_null_or_empty": (lambda rng, n, w: [rng.choice(("", None, "x", 0)) for _ in range(n)], _map(su.is_null_or_empty)),
+    "string_utils.is_whitespace_or_empty": (lambda rng, n, w: gen_texts(rng, n), _map(su.is_whitespace_or_empty)),
+    "string_utils.is_non_negative_integer": (lambda rng, n, w: [rng.choice((rng.randint(-5, 5), 1.5, "3")) for _ in range(n)], _map(su.is_non_negative_integer)),
+    "string_utils.is_positive_float": (lambda rng, n, w: [rng.choice((str(rng.uniform(-5, 5)), rng.random(), "abc", None)) for _ in range(n)], _map(su.is_positive_float)),
+    "string_utils.scan_file": (_write_scan_file, lambda path: list(su.scan_file(path)), "lines"),
+    # url_utils
+    "url_utils.is_valid_url": (lambda rng, n, w: gen_urls(rng, n), _map(uu.is_valid_url)),
+    "url_utils.is_valid_url_cached": (lambda rng, n, w: _repeated(gen_urls(rng, n), rng), _map(uu.is_valid_url_cached)),
+    "url_utils.urlparse_cached": (lambda rng, n, w: _repeated(gen_urls(rng, n), rng), _map(uu.urlparse_cached)),
+    "url_utils.is_domain_url": (lambda rng, n, w: [(u, DOMAINS[:2], ["film", "books"]) for u in gen_urls(rng, n)], _star(uu.is_domain_url)),
+    "url_utils.validate_url": (lambda rng, n, w: [(u, DOMAINS[:3]) for u in gen_urls(rng, n)], _star(uu.validate_url)),
+    "url_utils.build_url": (lambda rng, n, w: [(f"https://{rng.choice(DOMAINS)}/", "user", f"/{rng.randint(0, 999)}/", "list") for _ in range(n)], _star(uu.build_url)),
+    "url_utils.extract_path_segment": (lambda rng, n, w: [(u, "/", "/") for u in gen_urls(rng, n)], _star(uu.extract_path_segment)),
+    "url_utils.parse_url_path": (lambda rng, n, w: [(u, {"first": 0, "third": 2}) for u in gen_urls(rng, n)], _star(uu.parse_url_path)),
+    "url_utils.urls_match": (_pairs(gen_urls), _star(uu.urls_match)),
+    "url_utils.scan_urls": (_write_scan_file, lambda path: list(uu.scan_urls(path)), "lines"),
+    # datetime_utils
+    "datetime_utils.parse_datetime": (lambda rng, n, w: gen_date_strings(rng, n), _map(du.parse_datetime)),
+    "datetime_utils.parse_datetime_cached": (lambda rng, n, w: _repeated(gen_date_strings(rng, n), rng), _map(du.parse_datetime_cached)),
+    "datetime_utils.format_datetime": (lambda rng, n, w: gen_datetimes(rng, n), _map(du.format_datetime)),
+    "datetime_utils.smart_format_datetime": (lambda rng, n, w: gen_mixed_dates(rng, n), _map(du.smart_format_datetime)),
+    "datetime_utils.now": (lambda rng, n, w: n, _repeat_call(du.now)),
+    "datetime_utils.today": (lambda rng, n, w: n, _repeat_call(du.today)),
+    "datetime_utils.get_timestamp": (lambda rng, n, w: n, _repeat_call(du.get_timestamp)),
+    "datetime_utils.is_newer": (_pairs(gen_mixed_dates), _star(du.is_newer)),
+    "datetime_utils.should_update": (_pairs(gen_mixed_dates), _star(du.should_update)),
+    "datetime_utils.from_timestamp": (lambda rng, n, w: [rng.uniform(0, 2e9) for _ in range(n)], _map(du.from_timestamp)),
+    "datetime_utils.to_timestamp": (lambda rng, n, w: [d for d in gen_mixed_dates(rng, n) if d is not None], _map(du.to_timestamp)),
+    "datetime_utils.get_latest": (lambda rng, n, w: [tuple(gen_mixed_dates(rng, 5)) for _ in range(n)], _star(du.get_latest)),
+    "datetime_utils.get_earliest": (lambda rng, n, w: [tuple(gen_mixed_dates(rng, 5)) for _ in range(n)], _star(du.get_earliest)),
+    # file_utils
+    "file_utils.to_csv_string": (lambda rng, n, w: gen_rows(rng, n), fu.to_csv_string),
+    "file_utils.from_csv_string": (lambda rng, n, w: fu.to_csv_string(gen_rows(rng, n)), fu.from_csv_string, "rows"),
+    "file_utils.write_indexed": (lambda rng, n, w: (os.path.join(w, f"write_{n}.jsonl"), gen_rows(rng, n)), lambda data: fu.write_indexed(data[0], data[1], key="id"), "args"),
+    "file_utils.build_index": (_write_jsonl_file, _rebuild_index, "lines"),
+    "file_utils.IndexedReader.get": (_open_indexed_reader, lambda data: [data[0].get(key) for key in data[1]], "args"),
+    # concurrency_utils
+    "concurrency_utils.run_parallel": (lambda rng, n, w: list(range(n)), lambda items: cu.run_parallel(abs, items, max_workers=4)),
+    "concurrency_utils.run_parallel_async": (lambda rng, n, w: list(range(n)), lambda items: asyncio.run(cu.run_parallel_async(_async_abs, items, max_concurrency=16))),
+    "concurrency_utils.iter_parallel_async": (lambda rng, n, w: list(range(n)), lambda items: asyncio.run(_drain(cu.iter_parallel_async(_async_abs, items, max_concurrency=16)))),
+    "concurrency_utils.to_async": (lambda rng, n, w: list(range(n)), lambda items: asyncio.run(cu.run_parallel_async(cu.to_async(abs), items, max_concurrency=16))),
+}
+
+
+def _item_count(data, unit: str | None) -> int:
+    if unit == "lines":
+        with open(data, "rb") as f:
+            return sum(1 for _ in f)
+    if unit == "args":
+        return len(data[1])
+    if unit == "rows":
+        return data.count("\n") - 1
+    return data if isinstance(data, int) else len(data)
+
+
+def public_functions(module) -> list[str]:
+    """Names of the public functions defined (or memoized) in a module."""
+    names = []
+    for name in dir(module):
+        obj = getattr(module, name)
+        if name.startswith("_") or isinstance(obj, type) or not callable(obj):
+            continue
+        if getattr(obj, "__module__", None) == module.__name__ or hasattr(obj, "cache_info"):
+            names.append(f"{module.__name__.rsplit('.', 1)[-1]}.{name}")
+    return names
+
+
+def uncovered_functions() -> list[str]:
+    return sorted(name for module in COVERED_MODULES for name in public_functions(module) if name not in CASES)
+
+
+def measure(run, data, repeat: int) -> tuple[float, int]:
+    """Return the best seconds per run() call and the number of calls per repeat."""
+    run(data)  # warm-up (also fills memoized caches)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run(data)
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_RUN_SECONDS or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(MIN_RUN_SECONDS / elapsed) + 1))
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run(data)
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best, loops
+
+
+def run_benchmarks(sizes: list[int], repeat: int, name_filter: str | None) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="ff-bench-") as workdir:
+        for name, case in CASES.items():
+            if name_filter and name_filter not in name:
+                continue
+            setup, run = case[0], case[1]
+            unit = case[2] if len(case) > 2 else None
+            for size in sizes:
+                rng = random.Random(f"{SEED}:{name}:{size}")
+                data = setup(rng, size, workdir)
+                items = max(_item_count(data, unit), 1)
+                seconds, loops = measure(run, data, repeat)
+                key = f"{name}[{size}]"
+                results[key] = {
+                    "case": name, "size": size, "items": items, "loops": loops,
+                    "seconds": seconds, "ns_per_item": seconds / items * 1e9,
+                }
+                print(f"{key:52} {seconds / items * 1e9:12.1f} ns/item  ({items} items)", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Return one entry per case present in both runs, flagging regressions."""
+    rows = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        limit = THRESHOLDS.get(current["case"], threshold)
+        ratio = current["ns_per_item"] / previous["ns_per_item"] if previous["ns_per_item"] else 1.0
+        rows.append({"key": key, "ratio": ratio, "threshold": limit, "regressed": ratio > 1 + limit})
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated dataset sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="repeats per case, best is kept")
+    parser.add_argument("--filter", dest="name_filter", help="only run cases whose name contains this")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--save-baseline", help="write results as a baseline to this file")
+    parser.add_argument("--baseline", help="compare against this baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (0.2 = 20%%), unless THRESHOLDS overrides it")
+    parser.add_argument("--strict", action="store_true", help="fail when a public function has no case")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = run_benchmarks(sizes, args.repeat, args.name_filter)
+    document = {
+        "meta": {
+            "fastfingertips": fastfingertips.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "sizes": sizes,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    for path in (args.json_path, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=2)
+
+    failed = False
+    missing = uncovered_functions()
+    if missing:
+        print(f"\nUncovered public functions: {', '.join(missing)}")
+        failed |= args.strict
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("python") != document["meta"]["python"]:
+            print(f"\nNote: baseline was recorded on Python {baseline.get('meta', {}).get('python')}")
+        rows = compare(results, baseline.get("results", {}), args.threshold)
+        regressions = [row for row in rows if row["regressed"]]
+        print(f"\nCompared {len(rows)} cases against {args.baseline}: {len(regressions)} regression(s)")
+        for row in sorted(rows, key=lambda row: row["ratio"], reverse=True):
+            if row["regressed"] or row["ratio"] < 1 - row["threshold"]:
+                status = "SLOWER" if row["regressed"] else "faster"
+                print(f"{status:6}  {row['ratio']:6.2f}x  (limit {1 + row['threshold']:.2f}x)  {row['key']}")
+        failed |= bool(regressions)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
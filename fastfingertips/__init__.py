@@ -3,9 +3,111 @@ fastfingertips
 ~~~~~~~~~~~~~~
 
 A collection of personal Python utility functions.
+
+Submodules and their main functions are loaded lazily on first access,
+so ``import fastfingertips`` does not pull in optional heavy dependencies
+such as requests, bs4 or termcolor.
 """
 
+import importlib
+
 __title__ = "fastfingertips"
 __version__ = "0.1.3"
 __author__ = "FastFingertips"
 __license__ = "MIT"
+
+_SUBMODULES = (
+    "arrow_utils",
+    "bs4_utils",
+    "cache_utils",
+    "concurrency_utils",
+    "datetime_utils",
+    "file_utils",
+    "http_utils",
+    "logging_utils",
+    "metrics_utils",
+    "similarity_utils",
+    "string_utils",
+    "terminal_utils",
+    "url_utils",
+    "validation_utils",
+)
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "write_parquet": "arrow_utils",
+    "ArrowRecordWriter": "arrow_utils",
+    "get_soup": "bs4_utils",
+    "get_random_user_agent": "bs4_utils",
+    "memoize": "cache_utils",
+    "run_parallel": "concurrency_utils",
+    "run_parallel_async": "concurrency_utils",
+    "iter_parallel_async": "concurrency_utils",
+    "to_async": "concurrency_utils",
+    "parse_datetime": "datetime_utils",
+    "parse_datetime_cached": "datetime_utils",
+    "format_datetime": "datetime_utils",
+    "smart_format_datetime": "datetime_utils",
+    "get_timestamp": "datetime_utils",
+    "is_newer": "datetime_utils",
+    "should_update": "datetime_utils",
+    "get_latest": "datetime_utils",
+    "get_earliest": "datetime_utils",
+    "fetch": "http_utils",
+    "HedgedFetcher": "http_utils",
+    "to_csv_string": "file_utils",
+    "from_csv_string": "file_utils",
+    "write_indexed": "file_utils",
+    "build_index": "file_utils",
+    "IndexedWriter": "file_utils",
+    "IndexedReader": "file_utils",
+    "setup_logger": "logging_utils",
+    "shutdown_logger": "logging_utils",
+    "MinHashLSH": "similarity_utils",
+    "extract_pattern": "string_utils",
+    "extract_year": "string_utils",
+    "extract_number_from_text": "string_utils",
+    "clean_whitespace": "string_utils",
+    "slugify": "string_utils",
+    "slugify_cached": "string_utils",
+    "extract_year_cached": "string_utils",
+    "is_valid_email": "string_utils",
+    "scan_file": "string_utils",
+    "get_input": "terminal_utils",
+    "ask_confirmation": "terminal_utils",
+    "print_status": "terminal_utils",
+    "wait_with_progress": "terminal_utils",
+    "ProgressReporter": "terminal_utils",
+    "track": "terminal_utils",
+    "is_valid_url": "url_utils",
+    "is_valid_url_cached": "url_utils",
+    "urlparse_cached": "url_utils",
+    "is_domain_url": "url_utils",
+    "validate_url": "url_utils",
+    "build_url": "url_utils",
+    "extract_path_segment": "url_utils",
+    "parse_url_path": "url_utils",
+    "urls_match": "url_utils",
+    "scan_urls": "url_utils",
+    "compile_schema": "validation_utils",
+}
+
+__all__ = [*_SUBMODULES, *_EXPORTS]
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,263 @@
+import dataclasses
+import types
+import typing
+from datetime import date, datetime
+from typing import Any, Iterable
+
+from fastfingertips.datetime_utils import parse_datetime
+
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("arrow_utils needs pyarrow: pip install 'fastfingertips[arrow]'") from e
+    return pyarrow
+
+
+def _unwrap_optional(hint):
+    """Return X for Optional[X] / X | None, else the hint itself."""
+    origin = typing.get_origin(hint)
+    if origin is typing.Union or (hasattr(types, "UnionType") and origin is types.UnionType):
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return hint
+
+
+def _arrow_type(hint):
+    pa = _require_pyarrow()
+    hint = _unwrap_optional(hint)
+    if hint is bool:
+        return pa.bool_()
+    if hint is int:
+        return pa.int64()
+    if hint is float:
+        return pa.float64()
+    if hint is bytes:
+        return pa.binary()
+    if hint is datetime:
+        return pa.timestamp("us")
+    if hint is date:
+        return pa.date32()
+    if typing.get_origin(hint) in (list, tuple, set) and typing.get_args(hint):
+        return pa.list_(_arrow_type(typing.get_args(hint)[0]))
+    return pa.string()
+
+
+def schema_from_dataclass(cls: type, date_fields: Iterable[str] = ()):
+    """
+    Build a pyarrow schema from a dataclass's type hints.
+
+    str, int, float, bool, bytes, datetime, date and lists of those map to
+    the matching Arrow types; anything else is stored as a string. Fields
+    named in `date_fields` become timestamps whatever their annotation.
+
+    Examples:
+        >>> schema_from_dataclass(Book, date_fields=["last_update_date"])
+    """
+    pa = _require_pyarrow()
+    hints = typing.get_type_hints(cls)
+    date_fields = set(date_fields)
+    return pa.schema([
+        pa.field(field.name, pa.timestamp("us") if field.name in date_fields else _arrow_type(hints[field.name]))
+        for field in dataclasses.fields(cls)
+    ])
+
+
+def _to_mapping(record) -> dict:
+    if isinstance(record, dict):
+        return record
+    if dataclasses.is_dataclass(record):
+        # Shallow, unlike asdict(), which deep-copies every value
+        return {field.name: getattr(record, field.name) for field in dataclasses.fields(record)}
+    if hasattr(record, "to_dict"):
+        return record.to_dict()
+    return vars(record)
+
+
+def _parse_dates(values: list, cache: dict) -> list:
+    parsed = []
+    for value in values:
+        if isinstance(value, str):
+            if value not in cache:
+                cache[value] = parse_datetime(value)
+            value = cache[value]
+        parsed.append(value)
+    return parsed
+
+
+def to_record_batch(records: Iterable[Any], schema, date_fields: Iterable[str] = ()):
+    """
+    Convert rows (dicts, dataclasses or objects with to_dict) to a pyarrow RecordBatch.
+
+    Values of `date_fields` given as strings are parsed with
+    datetime_utils.parse_datetime; unparseable dates become nulls and
+    timezone-aware values are stored as UTC. Fields missing from a row are null.
+    """
+    pa = _require_pyarrow()
+    columns = {name: [] for name in schema.names}
+    for record in records:
+        row = _to_mapping(record)
+        for name, values in columns.items():
+            values.append(row.get(name))
+    cache = {}
+    for name in date_fields:
+        if name in columns:
+            columns[name] = _parse_dates(columns[name], cache)
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+class ArrowRecordWriter:
+    """
+    Stream rows into a compressed Parquet (or Arrow IPC) file.
+
+    Rows are buffered and written as one row group (or record batch) every
+    `row_group_size` rows, so memory stays bounded however many rows are
+    written. The schema is taken from `schema`, inferred from the first row
+    when it is a dataclass, or inferred by pyarrow from the first batch.
+    Pass `schema` when a column may be empty throughout the first batch,
+    or when no rows may be written at all.
+
+    Examples:
+        >>> with ArrowRecordWriter("books.parquet", date_fields=["last_update_date"]) as writer:
+        ...     writer.write_many(books)
+        >>> pyarrow.parquet.read_table("books.parquet", columns=["title", "rating"])
+    """
+
+    def __init__(self, path: str, schema=None, date_fields: Iterable[str] = (), compression: str | None = "zstd",
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE, format: str | None = None):
+        _require_pyarrow()
+        self.path = str(path)
+        self.schema = schema
+        self.date_fields = tuple(date_fields)
+        self.compression = compression
+        self.row_group_size = row_group_size
+        if format is None:
+            format = "arrow" if self.path.endswith((".arrow", ".feather", ".ipc")) else "parquet"
+        if format not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported format: {format!r} (expected 'parquet' or 'arrow')")
+        self.format = format
+        self.rows_written = 0
+        self._buffer = []
+        self._sink = None
+
+    def _infer_schema(self, rows: list):
+        pa = _require_pyarrow()
+        first = rows[0]
+        if dataclasses.is_dataclass(first):
+            return schema_from_dataclass(type(first), self.date_fields)
+        mappings = [_to_mapping(row) for row in rows]
+        cache = {}
+        for name in self.date_fields:
+            parsed = _parse_dates([row.get(name) for row in mappings], cache)
+            mappings = [{**row, name: value} for row, value in zip(mappings, parsed)]
+        schema = pa.RecordBatch.from_pylist(mappings).schema
+        for name in self.date_fields:
+            index = schema.get_field_index(name)
+            if index != -1:
+                schema = schema.set(index, pa.field(name, pa.timestamp("us")))
+        return schema
+
+    def _open(self) -> None:
+        pa = _require_pyarrow()
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            self._sink = pq.ParquetWriter(self.path, self.schema, compression=self.compression or "none")
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            self._sink = pa.ipc.new_file(self.path, self.schema, options=options)
+
+    def _flush_buffer(self) -> None:
+        if not self._buffer:
+            return
+        if self.schema is None:
+            self.schema = self._infer_schema(self._buffer)
+        if self._sink is None:
+            self._open()
+        pa = _require_pyarrow()
+        try:
+            batch = to_record_batch(self._buffer, self.schema, self.date_fields)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            empty = [field.name for field in self.schema if pa.types.is_null(field.type)]
+            if not empty:
+                raise
+            # The file was started with these columns typed as null, which cannot be changed
+            raise ValueError(
+                f"Columns {empty} were empty in the first {self.row_group_size} rows, so their type could "
+                "not be inferred; pass schema= to ArrowRecordWriter"
+            ) from e
+        if self.format == "parquet":
+            self._sink.write_batch(batch, row_group_size=self.row_group_size)
+        else:
+            self._sink.write_batch(batch)
+        self.rows_written += batch.num_rows
+        self._buffer = []
+
+    def write(self, record) -> None:
+        """Buffer one row, writing a row group when the buffer is full."""
+        self._buffer.append(record)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush_buffer()
+
+    def write_many(self, records: Iterable[Any]) -> int:
+        """Write rows, returning how many were added."""
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        """
+        Write any buffered rows and finish the file.
+
+        Raises:
+            ValueError: If no rows were written and no schema was given,
+                        as there is then no schema to write an empty file with
+        """
+        self._flush_buffer()
+        if self._sink is None:
+            if self.schema is None:
+                raise ValueError(f"No rows were written to {self.path} and no schema was given; pass schema=")
+            self._open()  # no rows: still produce a valid, empty file
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_parquet(path: str, records: Iterable[Any], schema=None, date_fields: Iterable[str] = (),
+                  compression: str | None = "zstd", row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """
+    Write rows to a compressed Parquet file in row groups.
+
+    Args:
+        path: Output file
+        records: Dicts, dataclass instances (e.g. Book) or objects with to_dict()
+        schema: pyarrow.Schema (default: inferred, see ArrowRecordWriter)
+        date_fields: Fields whose string values are parsed into timestamps
+        compression: Parquet codec ("zstd", "snappy", "gzip", ... or None)
+        row_group_size: Rows per row group
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ValueError: If `records` is empty and no `schema` is given, or if a
+                    column's type cannot be inferred from the first row group
+
+    Examples:
+        >>> write_parquet("books.parquet", books, date_fields=["last_update_date"])
+        120
+    """
+    with ArrowRecordWriter(path, schema, date_fields, compression, row_group_size, format="parquet") as writer:
+        writer.write_many(records)
+    return writer.rows_written
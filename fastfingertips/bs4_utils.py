@@ -1,6 +1,11 @@
 import random
-import requests
-from bs4 import BeautifulSoup
+import threading
+import time
+from fastfingertips import http_utils, metrics_utils
+
+_SOUP_REQUESTS = metrics_utils.counter("fastfingertips_get_soup_requests_total", "get_soup calls by outcome.")
+_SOUP_BYTES = metrics_utils.counter("fastfingertips_get_soup_response_bytes_total", "Response body bytes fetched by get_soup.")
+_SOUP_SECONDS = metrics_utils.histogram("fastfingertips_get_soup_seconds", "get_soup fetch and parse latency.")
 
 def get_random_user_agent():
     """Returns a random modern User-Agent string."""
@@ -18,11 +23,52 @@ def get_random_user_agent():
     ]
     return random.choice(uastrings)
 
-def get_soup(url, headers=None):
-    """Fetches a URL and returns a BeautifulSoup object."""
+_hedged_fetcher = None
+_hedged_fetcher_lock = threading.Lock()
+
+
+def _get_hedged_fetcher():
+    global _hedged_fetcher
+    with _hedged_fetcher_lock:
+        if _hedged_fetcher is None:
+            _hedged_fetcher = http_utils.HedgedFetcher()
+        return _hedged_fetcher
+
+
+def get_soup(url, headers=None, timeout=http_utils.DEFAULT_TIMEOUT, hedge=False):
+    """
+    Fetches a URL and returns a BeautifulSoup object.
+
+    Args:
+        url: URL to fetch
+        headers: Request headers (default: a random User-Agent)
+        timeout: Total seconds allowed for the request, body included (None for no limit)
+        hedge: If True, send a duplicate request when the first one is slower
+               than the host's running p95 latency (see http_utils.HedgedFetcher)
+    """
+    # Imported on first use so that importing this module stays cheap
+    from bs4 import BeautifulSoup
+
     if headers is None:
         headers = {'User-Agent': get_random_user_agent()}
-    
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    return BeautifulSoup(response.text, 'html.parser')
+
+    def fetch():
+        if hedge:
+            return _get_hedged_fetcher().get(url, headers=headers, timeout=timeout)
+        return http_utils.fetch(url, headers=headers, timeout=timeout)
+
+    if not metrics_utils.REGISTRY.enabled:
+        return BeautifulSoup(fetch().text, 'html.parser')
+
+    start = time.perf_counter()
+    try:
+        response = fetch()
+        _SOUP_BYTES.inc(len(response.content))
+        soup = BeautifulSoup(response.text, 'html.parser')
+    except Exception:
+        _SOUP_REQUESTS.inc(outcome="error")
+        raise
+    finally:
+        _SOUP_SECONDS.observe(time.perf_counter() - start)
+    _SOUP_REQUESTS.inc(outcome="ok")
+    return soup
@@ -0,0 +1,222 @@
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from typing import Callable
+
+CacheInfo = namedtuple("CacheInfo", "hits misses evictions expirations uncacheable currsize bytes")
+
+# CO_COROUTINE flag; checked directly so this module does not need to import inspect or asyncio
+_CO_COROUTINE = 0x0080
+
+_MISSING = object()
+
+
+def _is_coroutine_function(func: Callable) -> bool:
+    code = getattr(func, "__code__", None)
+    return code is not None and bool(code.co_flags & _CO_COROUTINE)
+
+
+# Separates positional from keyword arguments in a key, so f(1, x=2) and
+# f((1,), (("x", 2),)) cannot collide (as functools._kwd_mark does)
+_KWD_MARK = object()
+
+
+def _make_key(args: tuple, kwargs: dict):
+    key = args + (_KWD_MARK, *sorted(kwargs.items())) if kwargs else args
+    hash(key)  # raises TypeError for unhashable arguments
+    return key
+
+
+class _Shard:
+    """One independently locked LRU segment of a MemoCache."""
+
+    __slots__ = ("lock", "entries", "bytes", "hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (value, expires_at, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class MemoCache:
+    """
+    Thread-safe LRU cache with optional TTL and approximate byte-size bound.
+
+    Keys are spread over independently locked shards, so concurrent callers
+    rarely contend on the same lock. Bounds apply per shard (the totals are
+    divided evenly), which makes eviction approximately, not strictly, LRU.
+    Sizes are measured with `sys.getsizeof` and do not follow references.
+    """
+
+    def __init__(self, maxsize: int | None = 1024, maxbytes: int | None = None,
+                 ttl: float | None = None, shards: int = 16):
+        if maxsize is not None and maxsize < shards:
+            shards = max(maxsize, 1)
+        self.ttl = ttl
+        self._shards = [_Shard() for _ in range(shards)]
+        self._shard_maxsize = -(-maxsize // shards) if maxsize is not None else None
+        self._shard_maxbytes = -(-maxbytes // shards) if maxbytes is not None else None
+        self.uncacheable = 0
+        self._uncacheable_lock = threading.Lock()
+
+    def _shard(self, key) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def record_uncacheable(self) -> None:
+        """Count a call whose arguments could not be used as a cache key."""
+        with self._uncacheable_lock:
+            self.uncacheable += 1
+
+    def get(self, key, default=_MISSING):
+        """Return the cached value for key, or `default` on a miss."""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                value, expires_at, size = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    shard.entries.move_to_end(key)
+                    shard.hits += 1
+                    return value
+                del shard.entries[key]
+                shard.bytes -= size
+                shard.expirations += 1
+            shard.misses += 1
+        return default
+
+    def set(self, key, value) -> None:
+        """Store a value, evicting least recently used entries past the bounds."""
+        size = sys.getsizeof(key) + sys.getsizeof(value) if self._shard_maxbytes is not None else 0
+        if self._shard_maxbytes is not None and size > self._shard_maxbytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        shard = self._shard(key)
+        with shard.lock:
+            old = shard.entries.pop(key, None)
+            if old is not None:
+                shard.bytes -= old[2]
+            shard.entries[key] = (value, expires_at, size)
+            shard.bytes += size
+            while (
+                (self._shard_maxsize is not None and len(shard.entries) > self._shard_maxsize)
+                or (self._shard_maxbytes is not None and shard.bytes > self._shard_maxbytes)
+            ):
+                _, (_, _, evicted_size) = shard.entries.popitem(last=False)
+                shard.bytes -= evicted_size
+                shard.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.bytes = shard.hits = shard.misses = shard.evictions = shard.expirations = 0
+        with self._uncacheable_lock:
+            self.uncacheable = 0
+
+    def info(self) -> CacheInfo:
+        """Return hit, miss, eviction and size statistics."""
+        totals = [0] * 6
+        for shard in self._shards:
+            with shard.lock:
+                for i, value in enumerate((shard.hits, shard.misses, shard.evictions,
+                                           shard.expirations, len(shard.entries), shard.bytes)):
+                    totals[i] += value
+        hits, misses, evictions, expirations, currsize, nbytes = totals
+        return CacheInfo(hits, misses, evictions, expirations, self.uncacheable, currsize, nbytes)
+
+
+def memoize(maxsize: int | None = 1024, maxbytes: int | None = None, ttl: float | None = None,
+            shards: int = 16) -> Callable:
+    """
+    Memoize a function or coroutine function with a MemoCache.
+
+    Calls with unhashable arguments bypass the cache. For coroutine
+    functions, concurrent misses for the same arguments share a single
+    in-flight call; exceptions are never cached.
+
+    Args:
+        maxsize: Maximum number of entries (None for no entry limit)
+        maxbytes: Approximate maximum total size of keys and values in bytes
+        ttl: Seconds an entry stays valid (None for no expiry)
+        shards: Number of independently locked cache segments
+
+    Returns:
+        Decorator. The wrapped function has `cache_info()`, `cache_clear()`
+        and `cache` attributes.
+
+    Examples:
+        >>> @memoize(maxsize=4096, ttl=60)
+        ... def lookup(name): ...
+        >>> lookup.cache_info().hits
+        0
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = MemoCache(maxsize=maxsize, maxbytes=maxbytes, ttl=ttl, shards=shards)
+
+        if _is_coroutine_function(func):
+            inflight = {}
+            inflight_lock = threading.Lock()
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                import asyncio
+
+                try:
+                    key = _make_key(args, kwargs)
+                except TypeError:
+                    cache.record_uncacheable()
+                    return await func(*args, **kwargs)
+
+                value = cache.get(key)
+                if value is not _MISSING:
+                    return value
+
+                loop = asyncio.get_running_loop()
+                with inflight_lock:
+                    task = inflight.get((loop, key))
+                    if task is None:
+                        task = loop.create_task(func(*args, **kwargs))
+                        inflight[(loop, key)] = task
+
+                        def finished(done_task, inflight_key=(loop, key)):
+                            with inflight_lock:
+                                inflight.pop(inflight_key, None)
+                            if not done_task.cancelled() and done_task.exception() is None:
+                                cache.set(key, done_task.result())
+
+                        task.add_done_callback(finished)
+                # Shielded so one cancelled caller does not cancel the shared call
+                return await asyncio.shield(task)
+
+            wrapper = async_wrapper
+        else:
+            @wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                try:
+                    key = _make_key(args, kwargs)
+                except TypeError:
+                    cache.record_uncacheable()
+                    return func(*args, **kwargs)
+
+                value = cache.get(key)
+                if value is not _MISSING:
+                    return value
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+                return value
+
+            wrapper = sync_wrapper
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -1,11 +1,62 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Iterable, Any
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from functools import partial, wraps
+from typing import AsyncIterator, Callable, Iterable, Any
+from fastfingertips import metrics_utils
 
-def run_parallel(func: Callable, items: Iterable, max_workers: int = 5) -> list[Any]:
-    """Runs a function against multiple items in parallel using threads."""
+_TASKS = metrics_utils.counter("fastfingertips_run_parallel_tasks_total", "run_parallel tasks by outcome.")
+_QUEUE_WAIT_SECONDS = metrics_utils.histogram("fastfingertips_run_parallel_queue_wait_seconds", "Time tasks wait for a free worker.")
+_EXEC_SECONDS = metrics_utils.histogram("fastfingertips_run_parallel_exec_seconds", "Time tasks spend executing.")
+
+
+def _timed(func: Callable) -> Callable:
+    """Wrap func to record queue wait (submit to start) and execution time."""
+    def call(item, submitted_at):
+        started_at = time.perf_counter()
+        _QUEUE_WAIT_SECONDS.observe(started_at - submitted_at)
+        try:
+            result = func(item)
+        except Exception:
+            _TASKS.inc(outcome="error")
+            raise
+        finally:
+            _EXEC_SECONDS.observe(time.perf_counter() - started_at)
+        _TASKS.inc(outcome="ok")
+        return result
+    return call
+
+
+def _make_progress(progress, items: list):
+    if progress is True:
+        from fastfingertips.terminal_utils import ProgressReporter
+        return ProgressReporter(total=len(items))
+    return progress or None
+
+
+def run_parallel(func: Callable, items: Iterable, max_workers: int = 5, progress=None) -> list[Any]:
+    """
+    Runs a function against multiple items in parallel using threads.
+
+    Args:
+        func: Function called with each item
+        items: Items to process
+        max_workers: Number of worker threads
+        progress: True to show a ProgressReporter, or a ProgressReporter to update;
+                  failed items are counted as errors
+
+    Returns:
+        Results (or raised exceptions) in completion order
+    """
+    items = list(items)
+    progress = _make_progress(progress, items)
     results = []
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_item = {executor.submit(func, item): item for item in items}
+        if metrics_utils.REGISTRY.enabled:
+            timed = _timed(func)
+            future_to_item = {executor.submit(timed, item, time.perf_counter()): item for item in items}
+        else:
+            future_to_item = {executor.submit(func, item): item for item in items}
         for future in as_completed(future_to_item):
             try:
                 data = future.result()
@@ -13,4 +64,192 @@ def run_parallel(func: Callable, items: Iterable, max_workers: int = 5) -> list[
             except Exception as e:
                 # In case of error, we can return the exception or a custom message
                 results.append(e)
+                if progress is not None:
+                    progress.update(error=True)
+                continue
+            if progress is not None:
+                progress.update()
+    if progress is not None:
+        progress.close()
     return results
+
+
+# Bound on threads used by to_async when no executor is given
+BRIDGE_MAX_WORKERS = 16
+
+_bridge_executor = None
+_bridge_lock = threading.Lock()
+
+
+def _shared_bridge_executor() -> ThreadPoolExecutor:
+    global _bridge_executor
+    with _bridge_lock:
+        if _bridge_executor is None:
+            _bridge_executor = ThreadPoolExecutor(max_workers=BRIDGE_MAX_WORKERS, thread_name_prefix="to-async")
+        return _bridge_executor
+
+
+def to_async(func: Callable, executor: Executor | None = None) -> Callable:
+    """
+    Wrap a blocking callable so it can be awaited without blocking the event loop.
+
+    Calls run on `executor`, or on a shared thread pool limited to
+    BRIDGE_MAX_WORKERS threads, so a burst of calls queues up instead of
+    starting a thread each. Context variables are propagated to the call.
+
+    Examples:
+        >>> fetch_async = to_async(requests.get)
+        >>> response = await fetch_async("https://example.com", timeout=10)
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        import asyncio
+        import contextvars
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(executor or _shared_bridge_executor(), call)
+
+    return wrapper
+
+
+def _record_outcome(outcome: str) -> None:
+    if metrics_utils.REGISTRY.enabled:
+        _TASKS.inc(outcome=outcome)
+
+
+async def iter_parallel_async(func: Callable, items: Iterable, max_concurrency: int = 10,
+                              timeout: float | None = None, overall_timeout: float | None = None,
+                              fail_fast: bool = False, progress=None) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Run a coroutine function against multiple items concurrently, yielding
+    (index, result) pairs as they complete.
+
+    At most `max_concurrency` calls are in flight; items are started in
+    order as slots free up. Failed items yield their exception as the
+    result, and items that exceed `timeout` yield an asyncio.TimeoutError.
+    When `overall_timeout` expires, unfinished calls are cancelled and every
+    item without a result yields an asyncio.TimeoutError. Closing the
+    iterator early cancels the calls still running.
+
+    Args:
+        func: Coroutine function called with each item (see to_async for blocking callables)
+        items: Items to process
+        max_concurrency: Maximum number of concurrent calls
+        timeout: Seconds allowed per item (None for no limit)
+        overall_timeout: Seconds allowed for all items (None for no limit)
+        fail_fast: Cancel the remaining calls and raise the first exception instead of yielding it
+        progress: True to show a ProgressReporter, or a ProgressReporter to update
+
+    Yields:
+        (index of the item in `items`, result or exception)
+
+    Raises:
+        ValueError: If max_concurrency is less than 1
+    """
+    import asyncio
+
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+    items = list(items)
+    progress = _make_progress(progress, items)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + overall_timeout if overall_timeout is not None else None
+    pending_items = iter(enumerate(items))
+    finished = asyncio.Queue()
+
+    async def call(item):
+        if timeout is None:
+            return await func(item)
+        return await asyncio.wait_for(func(item), timeout)
+
+    async def worker():
+        for index, item in pending_items:
+            try:
+                result = await call(item)
+                outcome = "ok"
+            except asyncio.TimeoutError as e:
+                result, outcome = e, "timeout"
+            except Exception as e:
+                result, outcome = e, "error"
+            _record_outcome(outcome)
+            finished.put_nowait((index, result, outcome != "ok"))
+
+    workers = [loop.create_task(worker()) for _ in range(min(max_concurrency, len(items)))]
+    done = set()
+    try:
+        while len(done) < len(items):
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                index, result, failed = await asyncio.wait_for(finished.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            done.add(index)
+            if progress is not None:
+                progress.update(error=failed)
+            if failed and fail_fast:
+                raise result
+            yield index, result
+
+        if len(done) < len(items):
+            # Overall deadline reached: stop the workers, then report what is left
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            while not finished.empty():
+                index, result, failed = finished.get_nowait()
+                done.add(index)
+                if progress is not None:
+                    progress.update(error=failed)
+                yield index, result
+            for index in range(len(items)):
+                if index not in done:
+                    _record_outcome("timeout")
+                    if progress is not None:
+                        progress.update(error=True)
+                    if fail_fast:
+                        raise asyncio.TimeoutError(f"Overall timeout of {overall_timeout}s exceeded")
+                    yield index, asyncio.TimeoutError(f"Overall timeout of {overall_timeout}s exceeded")
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if progress is not None:
+            progress.close()
+
+
+async def run_parallel_async(func: Callable, items: Iterable, max_concurrency: int = 10,
+                             timeout: float | None = None, overall_timeout: float | None = None,
+                             fail_fast: bool = False, ordered: bool = True, progress=None) -> list[Any]:
+    """
+    Asyncio counterpart of run_parallel: await a coroutine function against
+    multiple items with a concurrency cap and deadlines.
+
+    Args:
+        func: Coroutine function called with each item (see to_async for blocking callables)
+        items: Items to process
+        max_concurrency: Maximum number of concurrent calls
+        timeout: Seconds allowed per item (None for no limit)
+        overall_timeout: Seconds allowed for all items; unfinished items get an asyncio.TimeoutError
+        fail_fast: Cancel the remaining calls and raise the first exception
+        ordered: Return results in the order of `items` instead of completion order
+        progress: True to show a ProgressReporter, or a ProgressReporter to update
+
+    Returns:
+        Results (or exceptions, unless fail_fast) in item or completion order
+
+    Examples:
+        >>> results = await run_parallel_async(fetch_page, urls, max_concurrency=20, timeout=10)
+    """
+    items = list(items)
+    if ordered:
+        results = [None] * len(items)
+        async for index, result in iter_parallel_async(func, items, max_concurrency, timeout,
+                                                       overall_timeout, fail_fast, progress):
+            results[index] = result
+        return results
+    return [result async for _, result in iter_parallel_async(func, items, max_concurrency, timeout,
+                                                               overall_timeout, fail_fast, progress)]
@@ -1,4 +1,23 @@
 from datetime import datetime
+from fastfingertips import metrics_utils
+from fastfingertips.cache_utils import memoize
+
+_PARSE_CALLS = metrics_utils.counter("fastfingertips_parse_datetime_total", "parse_datetime calls by outcome.")
+_FORMAT_MISSES = metrics_utils.counter("fastfingertips_parse_datetime_format_misses_total", "Formats tried by parse_datetime that did not match.")
+
+# Default common formats
+_DEFAULT_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",           # 2025-09-28 07:15:21
+    "%Y-%m-%d",                     # 2025-09-28
+    "%d/%m/%Y",                     # 28/09/2025
+    "%m/%d/%Y",                     # 09/28/2025
+    "%d-%m-%Y",                     # 28-09-2025
+    "%Y/%m/%d",                     # 2025/09/28
+    "%d.%m.%Y",                     # 28.09.2025
+    "%Y-%m-%d %H:%M:%S.%f",        # 2025-09-28 07:15:21.123456
+)
+# Caller-supplied formats are reported as "other" so they cannot grow the label set without bound
+_FORMAT_LABELS = frozenset(_DEFAULT_FORMATS)
 
 
 def parse_datetime(date_string: str | None, formats: list[str] | None = None) -> datetime | None:
@@ -23,34 +42,35 @@ def parse_datetime(date_string: str | None, formats: list[str] | None = None) ->
     if not date_string:
         return None
     
-    # Default common formats
-    default_formats = [
-        "%Y-%m-%d %H:%M:%S",           # 2025-09-28 07:15:21
-        "%Y-%m-%d",                     # 2025-09-28
-        "%d/%m/%Y",                     # 28/09/2025
-        "%m/%d/%Y",                     # 09/28/2025
-        "%d-%m-%Y",                     # 28-09-2025
-        "%Y/%m/%d",                     # 2025/09/28
-        "%d.%m.%Y",                     # 28.09.2025
-        "%Y-%m-%d %H:%M:%S.%f",        # 2025-09-28 07:15:21.123456
-    ]
+    formats_to_try = formats if formats else _DEFAULT_FORMATS
     
-    formats_to_try = formats if formats else default_formats
+    record = metrics_utils.REGISTRY.enabled
     
     # Try ISO format first (most common)
     if 'T' in date_string:
         try:
-            return datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+            parsed = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+            if record:
+                _PARSE_CALLS.inc(outcome="ok")
+            return parsed
         except (ValueError, TypeError):
-            pass
+            if record:
+                _FORMAT_MISSES.inc(format="iso")
     
     # Try each format
     for fmt in formats_to_try:
         try:
-            return datetime.strptime(date_string, fmt)
+            parsed = datetime.strptime(date_string, fmt)
+            if record:
+                _PARSE_CALLS.inc(outcome="ok")
+            return parsed
         except (ValueError, TypeError):
+            if record:
+                _FORMAT_MISSES.inc(format=fmt if fmt in _FORMAT_LABELS else "other")
             continue
     
+    if record:
+        _PARSE_CALLS.inc(outcome="miss")
     return None
 
 
@@ -330,3 +350,8 @@ def get_earliest(*dates: datetime | str | None) -> datetime | str | None:
     # Find the earliest date and return in original format
     _, original = min(valid_dates, key=lambda x: x[0])
     return original
+
+
+# Memoized variant of parse_datetime; calls with a custom formats list bypass the cache.
+# Exposes cache_info() and cache_clear().
+parse_datetime_cached = memoize(maxsize=4096)(parse_datetime)
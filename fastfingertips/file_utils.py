@@ -1,5 +1,11 @@
+import bisect
 import csv
+import json
+import mmap
+import os
+import random
 from io import StringIO
+from typing import Iterable, Iterator
 
 
 def to_csv_string(rows: list[dict], columns: list[str] = None) -> str:
@@ -44,3 +50,385 @@ def from_csv_string(csv_string: str) -> list[dict]:
     
     reader = csv.DictReader(StringIO(csv_string))
     return list(reader)
+
+
+
+INDEX_SUFFIX = ".idx"
+_INDEX_VERSION = 1
+
+
+def _infer_format(path: str, format: str | None) -> str:
+    if format is None:
+        format = "csv" if str(path).lower().endswith(".csv") else "jsonl"
+    if format not in ("jsonl", "csv"):
+        raise ValueError(f"Unsupported format: {format!r} (expected 'jsonl' or 'csv')")
+    return format
+
+
+def _encode_csv_row(values: list) -> bytes:
+    output = StringIO()
+    csv.writer(output).writerow(values)
+    return output.getvalue().encode("utf-8")
+
+
+def _decode_csv_row(data: bytes) -> list[str]:
+    return next(csv.reader(StringIO(data.decode("utf-8"))), [])
+
+
+def _parse_record(raw: bytes, meta: dict) -> dict:
+    if meta["format"] == "csv":
+        return dict(zip(meta["columns"] or [], _decode_csv_row(raw)))
+    return json.loads(raw)
+
+
+def _iter_records(mm, start: int, end: int, format: str):
+    """Yield (offset, raw bytes) of each complete record in mm[start:end]."""
+    offset = start
+    while offset < end:
+        record_end = mm.find(b"\n", offset, end)
+        if record_end == -1:
+            return  # incomplete last line, still being written
+        if format == "csv":
+            # A quoted field may contain newlines: the record ends once its quotes balance
+            while mm[offset:record_end].count(b'"') % 2:
+                record_end = mm.find(b"\n", record_end + 1, end)
+                if record_end == -1:
+                    return
+        record_end += 1
+        if mm[offset:record_end].strip():
+            yield offset, mm[offset:record_end]
+        offset = record_end
+
+
+def _index_line(key, offset: int, length: int) -> str:
+    return f"{json.dumps(key, ensure_ascii=False, default=str)}\t{offset}\t{length}\n"
+
+
+def _read_index(index_path: str, data_size: int) -> tuple[dict | None, dict, int]:
+    """
+    Load an index file as (meta, {key: (offset, length)}, indexed end offset).
+
+    Meta is None when the index is missing. The end offset is -1 when the
+    entries cannot be trusted and must be rebuilt: an entry pointing past
+    the end of the data file or a partially written last entry.
+    """
+    if not os.path.exists(index_path):
+        return None, {}, 0
+    offsets = {}
+    end = 0
+    with open(index_path, "r", encoding="utf-8") as f:
+        header = f.readline()
+        if not header.endswith("\n"):
+            return None, {}, 0
+        meta = json.loads(header)
+        end = meta["data_start"]
+        for line in f:
+            if not line.endswith("\n"):
+                return meta, {}, -1
+            key, offset, length = line.split("\t")
+            offset, length = int(offset), int(length)
+            if offset + length > data_size:
+                return meta, {}, -1
+            # Integer keys are by far the most common; skip the JSON decoder for them
+            offsets[int(key) if key.isdigit() else json.loads(key)] = (offset, length)
+            if offset + length > end:
+                end = offset + length
+    return meta, offsets, end
+
+
+def _scan_entries(mm, start: int, end: int, meta: dict) -> list[tuple]:
+    """Return (key, offset, length) for the records in mm[start:end], keys as they read back from an index file."""
+    entries = []
+    for offset, raw in _iter_records(mm, start, end, meta["format"]):
+        key = json.loads(json.dumps(_parse_record(raw, meta).get(meta["key"]), ensure_ascii=False, default=str))
+        entries.append((key, offset, len(raw)))
+    return entries
+
+
+def _append_entries(mm, start: int, end: int, meta: dict, index_path: str) -> list[tuple]:
+    """Index the records in mm[start:end], appending them to the index file."""
+    entries = _scan_entries(mm, start, end, meta)
+    with open(index_path, "a", encoding="utf-8") as index_file:
+        index_file.writelines(_index_line(key, offset, length) for key, offset, length in entries)
+    return entries
+
+
+def _new_meta(format: str, key: str, columns: list[str] | None, data_start: int) -> dict:
+    return {"version": _INDEX_VERSION, "format": format, "key": key, "columns": columns, "data_start": data_start}
+
+
+def _initial_meta(mm, size: int, format: str, key: str, columns: list[str] | None) -> dict:
+    """Meta for a fresh index; a CSV header row, if columns are not given, is read from the data."""
+    data_start = 0
+    if format == "csv" and columns is None:
+        header = next(_iter_records(mm, 0, size, format), None)
+        if header is not None:
+            columns = _decode_csv_row(header[1])
+            data_start = header[0] + len(header[1])
+    return _new_meta(format, key, columns, data_start)
+
+
+def _map_file(f, size: int):
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+
+def build_index(path: str, key: str, format: str | None = None, columns: list[str] | None = None) -> int:
+    """
+    Create or update the sidecar index (`path` + ".idx") of a JSONL or CSV file.
+
+    Only the bytes after the last indexed record are read, so calling this
+    after rows were appended costs time proportional to the new rows.
+    A missing or damaged index, or one built for another key, is rebuilt.
+
+    Args:
+        path: Data file
+        key: Field whose value identifies each row
+        format: "jsonl" or "csv" (default: from the file extension)
+        columns: CSV column names, if the file has no header row
+
+    Returns:
+        Number of rows added to the index
+    """
+    format = _infer_format(path, format)
+    index_path = str(path) + INDEX_SUFFIX
+    size = os.path.getsize(path)
+    meta, _, indexed_end = _read_index(index_path, size)
+    if meta is not None and (meta["key"] != key or meta["format"] != format or indexed_end < 0):
+        meta = None
+
+    with open(path, "rb") as f:
+        mm = _map_file(f, size)
+        try:
+            if meta is None:
+                meta = _initial_meta(mm, size, format, key, columns)
+                indexed_end = meta["data_start"]
+                with open(index_path, "w", encoding="utf-8") as index_file:
+                    index_file.write(json.dumps(meta) + "\n")
+            return len(_append_entries(mm, indexed_end, size, meta, index_path))
+        finally:
+            if size:
+                mm.close()
+
+
+class IndexedWriter:
+    """
+    Append rows to a JSONL or CSV file while recording each row's byte
+    offset under its key in a sidecar index (`path` + ".idx").
+
+    An existing file is brought up to date with build_index first, so a
+    writer can be reopened to append. Data is flushed before the index, and
+    an index entry past the end of the data makes readers rebuild it, so an
+    interrupted writer never leaves entries pointing at missing rows.
+
+    Examples:
+        >>> with IndexedWriter("books.jsonl", key="id") as writer:
+        ...     writer.write_many(books)
+        >>> IndexedReader("books.jsonl").get(42)
+    """
+
+    def __init__(self, path: str, key: str, format: str | None = None, columns: list[str] | None = None):
+        self.path = str(path)
+        self.key = key
+        self.format = _infer_format(self.path, format)
+        self.columns = columns
+        self.index_path = self.path + INDEX_SUFFIX
+        self._started = False
+
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            build_index(self.path, key, self.format, columns)
+            meta, _, _ = _read_index(self.index_path, os.path.getsize(self.path))
+            self.columns = meta["columns"]
+            self._started = True
+        elif os.path.exists(self.index_path):
+            os.remove(self.index_path)
+
+        self._data = open(self.path, "ab")
+        self._offset = self._data.tell()
+        self._index = open(self.index_path, "a", encoding="utf-8")
+        if not self._started and (self.format == "jsonl" or self.columns is not None):
+            self._start()
+
+    def _start(self) -> None:
+        data_start = 0
+        if self.format == "csv":
+            header = _encode_csv_row(self.columns)
+            self._data.write(header)
+            data_start = self._offset = len(header)
+        self._index.write(json.dumps(_new_meta(self.format, self.key, self.columns, data_start)) + "\n")
+        self._started = True
+
+    def write(self, row: dict) -> None:
+        """Append one row."""
+        if not self._started:
+            self.columns = list(row.keys())
+            self._start()
+        key = row.get(self.key)
+        if self.format == "csv":
+            data = _encode_csv_row([row.get(column, "") for column in self.columns])
+            # Index the key as it reads back from the CSV file: a string, "" for None
+            key = ("" if key is None else str(key)) if self.key in self.columns else None
+        else:
+            data = (json.dumps(row, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        self._data.write(data)
+        self._index.write(_index_line(key, self._offset, len(data)))
+        self._offset += len(data)
+
+    def write_many(self, rows: Iterable[dict]) -> int:
+        """Append rows, returning how many were written."""
+        count = 0
+        for row in rows:
+            self.write(row)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        self._data.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        if not self._data.closed:
+            self.flush()
+            self._data.close()
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_indexed(path: str, rows: Iterable[dict], key: str, format: str | None = None,
+                  columns: list[str] | None = None) -> int:
+    """
+    Write rows to a new JSONL or CSV file with a sidecar key index,
+    replacing any existing file.
+
+    Returns:
+        Number of rows written
+    """
+    for stale in (str(path), str(path) + INDEX_SUFFIX):
+        if os.path.exists(stale):
+            os.remove(stale)
+    with IndexedWriter(path, key, format, columns) as writer:
+        return writer.write_many(rows)
+
+
+class IndexedReader:
+    """
+    Random access to a JSONL or CSV file through its sidecar index.
+
+    The data file is memory-mapped and only the requested rows are parsed.
+    Rows appended after the index was written (for example by a plain
+    append, without IndexedWriter) are indexed on open and by `reindex()`.
+    Duplicate keys resolve to the last row written.
+
+    A reader never writes the sidecar, so it is safe next to a running
+    IndexedWriter and on read-only data: rows the sidecar does not cover,
+    or all rows if it is missing or damaged, are indexed in memory only.
+    Run build_index to persist them.
+
+    Examples:
+        >>> with IndexedReader("books.jsonl") as reader:
+        ...     reader.get("9780132350884")
+        ...     list(reader.range("a", "c"))
+        ...     reader.sample(5, seed=1)
+    """
+
+    def __init__(self, path: str, key: str | None = None, format: str | None = None):
+        self.path = str(path)
+        self.index_path = self.path + INDEX_SUFFIX
+        meta, offsets, indexed_end = _read_index(self.index_path, os.path.getsize(self.path))
+        if meta is None and key is None:
+            raise FileNotFoundError(f"No usable index for {self.path}; pass key= to build one")
+        self.key = key or meta["key"]
+        self.format = _infer_format(self.path, format or (meta or {}).get("format"))
+        if meta is None or meta["key"] != self.key or meta["format"] != self.format or indexed_end < 0:
+            meta, offsets, indexed_end = None, {}, 0  # unusable sidecar: index everything in memory
+
+        self.meta = meta
+        self._offsets = offsets
+        self._indexed_end = indexed_end
+        self._file = open(self.path, "rb")
+        self._mm = b""
+        self._sorted_keys = None
+        self.reindex()
+
+    def reindex(self) -> int:
+        """
+        Index, in memory, the rows appended since the last call.
+        Returns how many were added.
+        """
+        size = os.path.getsize(self.path)
+        if size == len(self._mm):
+            return 0
+        # Remap to see the appended bytes, then index only the records after the last indexed one
+        if not isinstance(self._mm, bytes):
+            self._mm.close()
+        self._mm = _map_file(self._file, size)
+        if self.meta is None:
+            self.meta = _initial_meta(self._mm, size, self.format, self.key, None)
+            self._indexed_end = self.meta["data_start"]
+        entries = _scan_entries(self._mm, self._indexed_end, size, self.meta)
+        for key, offset, length in entries:
+            self._offsets[key] = (offset, length)
+            self._indexed_end = offset + length
+        if entries:
+            self._sorted_keys = None
+        return len(entries)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, key) -> bool:
+        return key in self._offsets
+
+    def keys(self) -> list:
+        """All keys, in the order each key was first written (rewriting a key keeps its position)."""
+        return list(self._offsets)
+
+    def get_raw(self, key) -> bytes | None:
+        """Return the raw bytes of the row stored under key, or None."""
+        entry = self._offsets.get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self._mm[offset:offset + length]
+
+    def get(self, key, default=None) -> dict | None:
+        """Return the row stored under key, parsed, or `default`."""
+        raw = self.get_raw(key)
+        return default if raw is None else _parse_record(raw, self.meta)
+
+    def range(self, start=None, stop=None) -> Iterator[dict]:
+        """
+        Yield rows whose key is in [start, stop), in key order.
+
+        Keys must be mutually comparable (all strings or all numbers).
+        """
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._offsets)
+        keys = self._sorted_keys
+        low = 0 if start is None else bisect.bisect_left(keys, start)
+        high = len(keys) if stop is None else bisect.bisect_left(keys, stop)
+        for key in keys[low:high]:
+            yield self.get(key)
+
+    def sample(self, k: int, seed: int | None = None) -> list[dict]:
+        """Return up to k distinct rows chosen uniformly at random."""
+        keys = random.Random(seed).sample(list(self._offsets), min(k, len(self._offsets)))
+        return [self.get(key) for key in keys]
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        if not isinstance(self._mm, bytes):
+            self._mm.close()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
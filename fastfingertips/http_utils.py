@@ -0,0 +1,388 @@
+import heapq
+import itertools
+import math
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 30.0
+CHUNK_SIZE = 64 * 1024
+
+
+def _remaining(deadline: float | None) -> float | None:
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def _deadline_exceeded(url: str):
+    import requests
+    return requests.exceptions.Timeout(f"Deadline exceeded while fetching {url}")
+
+
+class _Scheduler:
+    """One background thread that runs callbacks at `time.monotonic()` times."""
+
+    def __init__(self):
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def call_at(self, when: float, func: Callable) -> list:
+        """Schedule func; pass the returned entry to cancel() to drop it."""
+        entry = [when, next(self._sequence), func]
+        with self._condition:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="http-utils-scheduler", daemon=True)
+                self._thread.start()
+            if self._heap[0] is entry:
+                self._condition.notify()
+        return entry
+
+    @staticmethod
+    def cancel(entry: list) -> None:
+        entry[2] = None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        func = heapq.heappop(self._heap)[2]
+                        break
+                    self._condition.wait(delay)
+            if func is not None:
+                try:
+                    func()
+                except Exception:
+                    pass
+
+
+_SCHEDULER = _Scheduler()
+_CURRENT = threading.local()
+
+
+class _Attempt:
+    """
+    Handle that lets another thread abort a fetch.
+
+    cancel() shuts down the socket of the connection the fetch is using,
+    which wakes up a read blocked in any stage of the request.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def attach(self, connection) -> None:
+        with self._lock:
+            self._connection = connection
+            if self.cancelled:
+                self._shutdown()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        sock = getattr(self._connection, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def _attach_current(connection) -> None:
+    attempt = getattr(_CURRENT, "attempt", None)
+    if attempt is not None:
+        attempt.attach(connection)
+
+
+_tracking_adapter_class = None
+
+
+def _tracking_adapter():
+    """HTTPAdapter whose connections register with the running attempt as soon as they are used."""
+    global _tracking_adapter_class
+    if _tracking_adapter_class is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        class TrackedMixin:
+            def connect(self):
+                _attach_current(self)
+                super().connect()
+                _attach_current(self)  # the socket exists now; abort at once if cancelled meanwhile
+
+            def request(self, *args, **kwargs):
+                _attach_current(self)
+                return super().request(*args, **kwargs)
+
+        class TrackedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = type("TrackedHTTPConnection", (TrackedMixin, HTTPConnection), {})
+
+        class TrackedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = type("TrackedHTTPSConnection", (TrackedMixin, HTTPSConnection), {})
+
+        class TrackingAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = {
+                    "http": TrackedHTTPConnectionPool, "https": TrackedHTTPSConnectionPool,
+                }
+
+        _tracking_adapter_class = TrackingAdapter
+    return _tracking_adapter_class()
+
+
+def _fetch(url: str, headers: dict | None, session, deadline: float | None, attempt: "_Attempt"):
+    import requests
+    from urllib3 import Timeout
+
+    remaining = _remaining(deadline)
+    if remaining is not None and remaining <= 0:
+        raise _deadline_exceeded(url)
+
+    getter = session.get if session is not None else requests.get
+    previous, _CURRENT.attempt = getattr(_CURRENT, "attempt", None), attempt
+    # The watchdog aborts the attempt at the deadline, whatever stage it is in
+    watchdog = _SCHEDULER.call_at(deadline, attempt.cancel) if deadline is not None else None
+    response = None
+    try:
+        # total= makes connecting and waiting for the headers share one budget
+        response = getter(url, headers=headers, timeout=Timeout(total=remaining), stream=True)
+        attempt.attach(getattr(response.raw, "_connection", None))
+        response.raise_for_status()
+        chunks = []
+        for chunk in response.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+        if attempt.cancelled:  # the shutdown may look like a clean end of the body
+            raise _deadline_exceeded(url)
+        # Store the body the way requests does, so .content and .text work as usual
+        response._content = b"".join(chunks)
+        response._content_consumed = True
+    except requests.exceptions.RequestException:
+        if attempt.cancelled:
+            raise _deadline_exceeded(url) from None
+        raise
+    finally:
+        if watchdog is not None:
+            _SCHEDULER.cancel(watchdog)
+        _CURRENT.attempt = previous
+        if response is not None:
+            response.close()
+    return response
+
+
+def fetch(url: str, headers: dict | None = None, timeout: float | None = DEFAULT_TIMEOUT,
+          session=None, deadline: float | None = None):
+    """
+    GET a URL within a total time budget.
+
+    Unlike the per-socket-operation timeout of requests, `timeout` bounds the
+    whole request: connecting and waiting for the headers share the budget,
+    and a watchdog closes the connection if the body is still being read at
+    the deadline, so a stalled or trickling server cannot extend it.
+
+    Args:
+        url: URL to fetch
+        headers: Optional request headers
+        timeout: Total seconds allowed (None for no limit)
+        session: Optional requests.Session to reuse connections
+        deadline: Absolute `time.monotonic()` deadline; overrides `timeout`
+
+    Returns:
+        requests.Response with its body already read
+
+    Raises:
+        requests.exceptions.Timeout: If the budget is exhausted
+        requests.exceptions.HTTPError: For 4xx/5xx responses
+    """
+    if deadline is None and timeout is not None:
+        deadline = time.monotonic() + timeout
+    return _fetch(url, headers, session, deadline, _Attempt())
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies per host."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, host: str, percent: float = 95) -> float | None:
+        """Return the latency percentile for host, or None until enough samples exist."""
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(len(ordered) * percent / 100) - 1)
+        return ordered[index]
+
+
+class _Race:
+    """Shared state of one hedged request: its attempts and the first response."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.primary = _Attempt()
+        self.hedge = None
+        self.hedge_future = None
+        self.winner = None
+        self.finished = False
+
+
+class HedgedFetcher:
+    """
+    Fetches URLs with hedging to cut tail latency.
+
+    The first attempt runs on the calling thread. If it takes longer than
+    the running p95 latency of its host, a duplicate request is sent from a
+    small worker pool and whichever succeeds first is returned; the other
+    attempt is aborted. Hedges are capped at `budget_percent` of all
+    requests, so the extra load stays small, and every attempt is bounded by
+    the request's deadline.
+
+    Each thread uses its own requests.Session, created by `session_factory`
+    (default: a Session whose connections can be aborted at any stage).
+
+    Examples:
+        >>> fetcher = HedgedFetcher(budget_percent=5)
+        >>> response = fetcher.get("https://example.com", timeout=10)
+    """
+
+    def __init__(self, budget_percent: float = 5.0, percentile: float = 95,
+                 tracker: LatencyTracker | None = None, session_factory: Callable | None = None,
+                 max_workers: int = 16):
+        self.budget_percent = budget_percent
+        self.percentile = percentile
+        self.tracker = tracker or LatencyTracker()
+        self.session_factory = session_factory
+        self.requests = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedged-fetch")
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            if self.session_factory is not None:
+                session = self.session_factory()
+            else:
+                import requests
+                session = requests.Session()
+                adapter = _tracking_adapter()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            if (self.hedges + 1) * 100 > self.budget_percent * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _attempt(self, url: str, headers: dict | None, deadline: float | None, host: str, attempt: _Attempt):
+        start = time.monotonic()
+        response = _fetch(url, headers, self._session(), deadline, attempt)
+        self.tracker.record(host, time.monotonic() - start)
+        return response
+
+    def _start_hedge(self, race: _Race, url: str, headers: dict | None, deadline: float | None, host: str) -> None:
+        # Runs on the scheduler thread once the primary attempt is slower than hedge_after
+        with race.lock:
+            if race.finished or not self._reserve_hedge():
+                return
+            race.hedge = _Attempt()
+            race.hedge_future = self._executor.submit(self._run_hedge, race, url, headers, deadline, host)
+
+    def _run_hedge(self, race: _Race, url: str, headers: dict | None, deadline: float | None, host: str):
+        response = self._attempt(url, headers, deadline, host, race.hedge)
+        with race.lock:
+            if race.winner is None:
+                race.winner = response
+                race.primary.cancel()
+        return response
+
+    def get(self, url: str, headers: dict | None = None, timeout: float | None = DEFAULT_TIMEOUT):
+        """Fetch a URL within `timeout` seconds, hedging slow attempts. See `fetch`."""
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+        host = urlsplit(url).netloc
+        with self._lock:
+            self.requests += 1
+
+        race = _Race()
+        hedge_after = self.tracker.percentile(host, self.percentile)
+        if hedge_after is None:
+            return self._attempt(url, headers, deadline, host, race.primary)
+
+        timer = _SCHEDULER.call_at(start + hedge_after, lambda: self._start_hedge(race, url, headers, deadline, host))
+        error = None
+        try:
+            response = self._attempt(url, headers, deadline, host, race.primary)
+        except Exception as e:
+            error = e
+        else:
+            with race.lock:
+                if race.winner is None:
+                    race.winner = response
+        finally:
+            _SCHEDULER.cancel(timer)
+
+        with race.lock:
+            race.finished = True
+            winner, hedge, hedge_future = race.winner, race.hedge, race.hedge_future
+        if winner is not None:
+            if hedge is not None:
+                hedge.cancel()
+            return winner
+        if hedge_future is None:
+            raise error
+        # The primary attempt failed by itself; the hedge may still succeed
+        try:
+            return hedge_future.result(timeout=_remaining(deadline))
+        except FutureTimeoutError:
+            hedge.cancel()
+            raise _deadline_exceeded(url) from None
+        except Exception:
+            raise error
+
+    def close(self) -> None:
+        """Stop the worker threads once running attempts finish and close the sessions."""
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
@@ -1,29 +1,246 @@
+import atexit
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+
+_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Queue listeners started by setup_logger(queued=True), keyed by logger name
+_listeners = {}
+_listeners_lock = threading.Lock()
+
+
+class _DeferredFlushMixin:
+    """Skips the per-record flush of stream handlers; the listener flushes once per batch."""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class _BatchFileHandler(_DeferredFlushMixin, logging.FileHandler):
+    pass
+
+
+class _BatchRotatingFileHandler(_DeferredFlushMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+class _BatchTimedRotatingFileHandler(_DeferredFlushMixin, logging.handlers.TimedRotatingFileHandler):
+    pass
+
+
+class _BatchStreamHandler(_DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue.
+
+    When the queue is full, records are dropped (and counted in `dropped`)
+    unless `block` is True, in which case the caller waits for space.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = False):
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record):
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # enqueue() may be called directly, outside the handler lock
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+# Put on the queue by BatchingQueueListener.stop() to end the drain loop
+_STOP = object()
+
+
+class BatchingQueueListener:
+    """
+    Background thread that drains a log queue up to `batch_size` records at
+    a time and flushes its handlers once per batch, or after `flush_interval`
+    seconds. Records below a handler's level are not passed to that handler.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers, batch_size: int = 256, flush_interval: float = 1.0):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the drain thread."""
+        if self._thread is not None:
+            raise RuntimeError("Listener is already started")
+        self._thread = threading.Thread(target=self._drain, name='BatchingQueueListener', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write out the records already queued, stop the drain thread and close the handlers."""
+        if self._thread is None:
+            return
+        # Blocking put: the stop marker must get through even when the queue is full
+        self.queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        for handler in self.handlers:
+            handler.close()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            if hasattr(handler, 'flush_batch'):
+                handler.flush_batch()
+            else:
+                handler.flush()
+
+    def _drain(self):
+        q = self.queue
+        last_flush = time.monotonic()
+        stopping = False
+        while not stopping:
+            try:
+                batch = [q.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            for record in batch:
+                if record is _STOP:
+                    stopping = True
+                else:
+                    self.handle(record)
+                q.task_done()
+
+            now = time.monotonic()
+            if stopping or now - last_flush >= self.flush_interval or len(batch) >= self.batch_size:
+                self._flush_handlers()
+                last_flush = now
+
+
+def _create_file_handler(log_file: str, queued: bool, max_bytes: int, when: str | None, backup_count: int):
+    if max_bytes and when:
+        raise ValueError("Use either max_bytes (size-based) or when (time-based) rotation, not both")
+    if max_bytes:
+        cls = _BatchRotatingFileHandler if queued else logging.handlers.RotatingFileHandler
+        return cls(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    if when:
+        cls = _BatchTimedRotatingFileHandler if queued else logging.handlers.TimedRotatingFileHandler
+        return cls(log_file, when=when, backupCount=backup_count, encoding='utf-8')
+    cls = _BatchFileHandler if queued else logging.FileHandler
+    return cls(log_file, encoding='utf-8')
+
+
+def setup_logger(
+    name: str,
+    log_file: str = "app.log",
+    level=logging.INFO,
+    *,
+    queued: bool = False,
+    max_bytes: int = 0,
+    when: str | None = None,
+    backup_count: int = 5,
+    queue_size: int = 10000,
+    block: bool = False,
+    batch_size: int = 256,
+    flush_interval: float = 1.0,
+):
+    """
+    To set up a logger that outputs to both file and console.
+
+    Args:
+        name: Logger name
+        log_file: Log file path (its directory is created if missing)
+        level: Logging level
+        queued: If True, log calls only enqueue the record; a background thread
+                writes batches to the file and console handlers
+        max_bytes: Rotate the log file when it reaches this size
+        when: Rotate the log file on a time interval (e.g. 'midnight', 'H')
+        backup_count: Number of rotated files to keep
+        queue_size: Maximum number of pending records in queued mode
+        block: In queued mode, wait for space when the queue is full instead
+               of dropping the record
+        batch_size: Maximum records written per batch in queued mode
+        flush_interval: Maximum seconds between flushes in queued mode
+
+    Returns:
+        logging.Logger: The configured logger. Calling this again for a
+        logger that already has handlers returns it unchanged.
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+
+    if logger.handlers:
+        return logger
 
-def setup_logger(name: str, log_file: str = "app.log", level=logging.INFO):
-    """To set up a logger that outputs to both file and console."""
     # Create logs directory if it doesn't exist
     log_dir = os.path.dirname(log_file)
     if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+        os.makedirs(log_dir, exist_ok=True)
 
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    formatter = logging.Formatter(_FORMAT)
 
     # File handler
-    file_handler = logging.FileHandler(log_file)
+    file_handler = _create_file_handler(log_file, queued, max_bytes, when, backup_count)
     file_handler.setFormatter(formatter)
 
     # Console handler
-    console_handler = logging.StreamHandler()
+    console_handler = _BatchStreamHandler() if queued else logging.StreamHandler()
     console_handler.setFormatter(formatter)
 
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    
-    if not logger.handlers:
+    if not queued:
         logger.addHandler(file_handler)
         logger.addHandler(console_handler)
+        return logger
 
+    log_queue = queue.Queue(maxsize=queue_size)
+    listener = BatchingQueueListener(
+        log_queue, file_handler, console_handler, batch_size=batch_size, flush_interval=flush_interval
+    )
+    logger.addHandler(BoundedQueueHandler(log_queue, block=block))
+    with _listeners_lock:
+        _listeners[name] = listener
+    listener.start()
     return logger
+
+
+def shutdown_logger(name: str) -> None:
+    """Flush pending records of a queued logger, stop its background thread and close its handlers."""
+    with _listeners_lock:
+        listener = _listeners.pop(name, None)
+    if listener is None:
+        return
+    listener.stop()
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        if isinstance(handler, BoundedQueueHandler):
+            logger.removeHandler(handler)
+
+
+@atexit.register
+def _shutdown_all() -> None:
+    for name in list(_listeners):
+        shutdown_logger(name)
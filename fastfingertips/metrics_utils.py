@@ -0,0 +1,372 @@
+import atexit
+import bisect
+import glob
+import json
+import os
+import threading
+
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values = {}
+
+    def _reinit_after_fork(self) -> None:
+        # The inherited lock may have been held by a parent thread at fork time; never acquire it
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+        return {"name": self.name, "type": self.kind, "help": self.help, "samples": samples}
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed upper-bound buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", buckets: tuple = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = [
+                {"labels": dict(key), "buckets": list(counts), "sum": total, "count": count}
+                for key, (counts, total, count) in self._values.items()
+            ]
+        return {
+            "name": self.name,
+            "type": self.kind,
+            "help": self.help,
+            "bucket_bounds": list(self.buckets),
+            "samples": samples,
+        }
+
+
+class MetricsRegistry:
+    """
+    Collection of named metrics.
+
+    Instrumented code checks `enabled` before touching a metric, so a
+    disabled registry costs a single attribute lookup per call. Each process
+    keeps its own values; a forked child starts from zero, and snapshots
+    written per process can be merged with `collect_multiprocess`.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name!r} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get_or_create(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets: tuple = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, buckets=buckets)
+
+    def reset(self) -> None:
+        """Reset all metric values, keeping the registered metrics."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    def _reinit_after_fork(self) -> None:
+        """Give a forked child fresh locks and zeroed values without touching the inherited locks."""
+        self._lock = threading.Lock()
+        for metric in list(self._metrics.values()):
+            metric._reinit_after_fork()
+
+    def snapshot(self) -> dict:
+        """Return the current values of all metrics as a JSON-serializable dict."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {"pid": os.getpid(), "metrics": [metric.snapshot() for metric in metrics]}
+
+
+REGISTRY = MetricsRegistry()
+_multiprocess_dir = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=REGISTRY._reinit_after_fork)
+
+
+def _dump_at_exit() -> None:
+    if _multiprocess_dir:
+        dump_process_snapshot(_multiprocess_dir)
+
+
+def enable(multiprocess_dir: str | None = None) -> None:
+    """
+    Enable metric collection.
+
+    Args:
+        multiprocess_dir: Optional directory where this process writes its
+            snapshot at exit, for merging with `collect_multiprocess`.
+            Worker processes should call `enable` with the same directory.
+            Calling again with another directory replaces it.
+    """
+    global _multiprocess_dir
+    REGISTRY.enabled = True
+    if multiprocess_dir:
+        os.makedirs(multiprocess_dir, exist_ok=True)
+        if _multiprocess_dir is None:
+            atexit.register(_dump_at_exit)
+        _multiprocess_dir = multiprocess_dir
+
+
+def disable() -> None:
+    """Disable metric collection. Recorded values are kept."""
+    REGISTRY.enabled = False
+
+
+def is_enabled() -> bool:
+    """Check if metric collection is enabled."""
+    return REGISTRY.enabled
+
+
+def counter(name: str, help: str = "") -> Counter:
+    """Get or create a counter in the default registry."""
+    return REGISTRY.counter(name, help)
+
+
+def gauge(name: str, help: str = "") -> Gauge:
+    """Get or create a gauge in the default registry."""
+    return REGISTRY.gauge(name, help)
+
+
+def histogram(name: str, help: str = "", buckets: tuple = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+    """Get or create a histogram in the default registry."""
+    return REGISTRY.histogram(name, help, buckets)
+
+
+def snapshot() -> dict:
+    """Return the current values of the default registry."""
+    return REGISTRY.snapshot()
+
+
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """
+    Merge snapshots from several processes by summing counters and histograms.
+    Gauges keep the value from the last snapshot that reports them.
+    """
+    merged = {}
+    for snap in snapshots:
+        for metric in snap.get("metrics", []):
+            target = merged.get(metric["name"])
+            if target is None:
+                target = merged[metric["name"]] = {key: value for key, value in metric.items() if key != "samples"}
+                target["samples"] = {}
+            for sample in metric["samples"]:
+                key = _label_key(sample["labels"])
+                existing = target["samples"].get(key)
+                if existing is None or metric["type"] == "gauge":
+                    target["samples"][key] = {**sample, "buckets": list(sample["buckets"])} if "buckets" in sample else dict(sample)
+                elif metric["type"] == "histogram":
+                    existing["buckets"] = [a + b for a, b in zip(existing["buckets"], sample["buckets"])]
+                    existing["sum"] += sample["sum"]
+                    existing["count"] += sample["count"]
+                else:
+                    existing["value"] += sample["value"]
+    for metric in merged.values():
+        metric["samples"] = list(metric["samples"].values())
+    return {"pid": None, "metrics": list(merged.values())}
+
+
+def dump_process_snapshot(directory: str) -> str:
+    """Write this process's snapshot to `directory` and return the file path."""
+    path = os.path.join(directory, f"metrics-{os.getpid()}.json")
+    _atomic_write(path, json.dumps(snapshot()))
+    return path
+
+
+def collect_multiprocess(directory: str) -> dict:
+    """Merge the snapshots written by `dump_process_snapshot` into one."""
+    snapshots = []
+    for path in sorted(glob.glob(os.path.join(directory, "metrics-*.json"))):
+        with open(path, encoding="utf-8") as f:
+            snapshots.append(json.load(f))
+    return merge_snapshots(snapshots)
+
+
+def to_prometheus_text(snap: dict | None = None) -> str:
+    """Render a snapshot (default: the current one) in Prometheus text exposition format."""
+    snap = snap if snap is not None else snapshot()
+    lines = []
+    for metric in snap["metrics"]:
+        name = metric["name"]
+        if metric["help"]:
+            lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for sample in metric["samples"]:
+            key = _label_key(sample["labels"])
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(key)} {_format_value(sample['value'])}")
+                continue
+            cumulative = 0
+            bounds = list(metric["bucket_bounds"]) + [float("inf")]
+            for bound, count in zip(bounds, sample["buckets"]):
+                cumulative += count
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(sample['sum'])}")
+            lines.append(f"{name}_count{_format_labels(key)} {sample['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def to_json(snap: dict | None = None) -> str:
+    """Render a snapshot (default: the current one) as JSON."""
+    return json.dumps(snap if snap is not None else snapshot(), indent=2)
+
+
+def _atomic_write(path: str, data: str) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_prometheus(path: str, snap: dict | None = None) -> None:
+    """Atomically write a snapshot in Prometheus text format, e.g. for a textfile collector."""
+    _atomic_write(path, to_prometheus_text(snap))
+
+
+def start_http_server(port: int = 9464, addr: str = "127.0.0.1", multiprocess_dir: str | None = None):
+    """
+    Serve metrics on a local HTTP endpoint from a background thread.
+
+    `/metrics` returns Prometheus text and `/metrics.json` returns JSON. When
+    `multiprocess_dir` is given, the served snapshot merges the files written
+    by other processes with the current process's values.
+
+    Returns:
+        The running server; call `shutdown()` on it to stop serving.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    def current_snapshot():
+        if not multiprocess_dir:
+            return snapshot()
+        # This process's own file is stale, the live values replace it
+        own_file = os.path.join(multiprocess_dir, f"metrics-{os.getpid()}.json")
+        snapshots = []
+        for path in sorted(glob.glob(os.path.join(multiprocess_dir, "metrics-*.json"))):
+            if path != own_file:
+                with open(path, encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+        snapshots.append(snapshot())
+        return merge_snapshots(snapshots)
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = to_prometheus_text(current_snapshot()).encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body = to_json(current_snapshot()).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="fastfingertips-metrics", daemon=True)
+    thread.start()
+    return server
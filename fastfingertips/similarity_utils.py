@@ -0,0 +1,196 @@
+import random
+import zlib
+from collections import defaultdict
+from typing import Hashable, Iterable
+
+from fastfingertips.string_utils import slugify
+
+_MASK_64 = (1 << 64) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_title(text: str) -> str:
+    """Normalize a title for fuzzy comparison: ASCII-fold, lowercase, collapse punctuation to spaces."""
+    return slugify(text, separator=" ")
+
+
+def char_ngrams(text: str, n: int = 3) -> set[str]:
+    """
+    Return the set of character n-grams of a normalized title.
+
+    Examples:
+        >>> sorted(char_ngrams("Dune", 3))
+        [' du', 'dun', 'ne ', 'une']
+    """
+    normalized = f" {normalize_title(text)} "
+    if len(normalized.strip()) == 0:
+        return set()
+    if len(normalized) <= n:
+        return {normalized}
+    return {normalized[i:i + n] for i in range(len(normalized) - n + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    """Jaccard similarity of two sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def optimal_bands(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows <= num_perm whose LSH S-curve
+    threshold, (1 / bands) ** (1 / rows), is closest to `threshold`.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class MinHashLSH:
+    """
+    Near-duplicate title index using character n-gram MinHash with LSH banding.
+
+    Each title becomes a MinHash signature of `num_perm` values; signatures
+    are split into `bands` bands of `rows` values, and titles sharing any
+    band become candidates. Lookups and inserts therefore touch only a few
+    buckets instead of every stored title. Lower `threshold` (more bands,
+    fewer rows) raises recall; higher raises precision. Candidates are
+    ranked by exact n-gram Jaccard similarity.
+
+    Examples:
+        >>> index = MinHashLSH(threshold=0.6)
+        >>> index.insert(1, "The Pragmatic Programmer")
+        >>> index.query("The Pragmatic Programmer (2nd Edition)", threshold=0.5)
+        [(1, 0.6...)]
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 128, ngram: int = 3,
+                 bands: int | None = None, rows: int | None = None, seed: int = 1):
+        if (bands is None) != (rows is None):
+            raise ValueError("Pass both bands and rows, or neither")
+        if bands is None:
+            bands, rows = optimal_bands(threshold, num_perm)
+        if bands * rows > num_perm:
+            raise ValueError("bands * rows must not exceed num_perm")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = rows
+
+        # Odd 64-bit multipliers for multiply-shift hashing, one per permutation
+        rng = random.Random(seed)
+        self._multipliers = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+        self._signatures = {}
+        self._shingles = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def signature(self, shingles: set[str]) -> tuple[int, ...]:
+        """Compute the MinHash signature of a shingle set."""
+        if not shingles:
+            return (_MAX_HASH,) * self.num_perm
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        # The top 32 bits of (a * h mod 2**64) are monotonic in the masked product,
+        # so the minimum can be taken before shifting
+        return tuple(min([(a * h) & _MASK_64 for h in hashes]) >> 32 for a in self._multipliers)
+
+    def _band_keys(self, signature: tuple[int, ...]):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def insert(self, key: Hashable, text: str) -> None:
+        """Add (or replace) a title under `key`."""
+        if key in self._signatures:
+            self.remove(key)
+        shingles = char_ngrams(text, self.ngram)
+        signature = self.signature(shingles)
+        self._signatures[key] = signature
+        self._shingles[key] = shingles
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].add(key)
+
+    def insert_many(self, items: Iterable[tuple[Hashable, str]]) -> None:
+        """Add several (key, title) pairs."""
+        for key, text in items:
+            self.insert(key, text)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a title from the index."""
+        signature = self._signatures.pop(key)
+        self._shingles.pop(key)
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band][band_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band][band_key]
+
+    def _candidates(self, signature: tuple[int, ...]) -> set:
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        return candidates
+
+    def query(self, text: str, k: int | None = None, threshold: float | None = None) -> list[tuple[Hashable, float]]:
+        """
+        Find stored titles similar to `text`.
+
+        Args:
+            text: Title to look up
+            k: Return at most this many results (default: all above threshold)
+            threshold: Minimum Jaccard similarity (default: the index threshold)
+
+        Returns:
+            List of (key, similarity), most similar first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        shingles = char_ngrams(text, self.ngram)
+        results = []
+        for key in self._candidates(self.signature(shingles)):
+            similarity = jaccard(shingles, self._shingles[key])
+            if similarity >= threshold:
+                results.append((key, similarity))
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results[:k] if k is not None else results
+
+    def near_duplicate_pairs(self, threshold: float | None = None) -> list[tuple[Hashable, Hashable, float]]:
+        """
+        Return every pair of stored titles at or above `threshold` Jaccard similarity.
+
+        Only pairs sharing an LSH bucket are compared, so the cost grows with
+        the number of candidates rather than with n².
+
+        Returns:
+            List of (key_a, key_b, similarity), most similar first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        seen = set()
+        pairs = []
+        for buckets in self._buckets:
+            for bucket in buckets.values():
+                if len(bucket) < 2:
+                    continue
+                members = sorted(bucket, key=repr)
+                for i, key_a in enumerate(members):
+                    for key_b in members[i + 1:]:
+                        pair = (key_a, key_b)
+                        if pair in seen:
+                            continue
+                        seen.add(pair)
+                        similarity = jaccard(self._shingles[key_a], self._shingles[key_b])
+                        if similarity >= threshold:
+                            pairs.append((key_a, key_b, similarity))
+        pairs.sort(key=lambda item: item[2], reverse=True)
+        return pairs
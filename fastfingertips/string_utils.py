@@ -1,5 +1,14 @@
+import itertools
+import mmap
+import os
 import re
 import unicodedata
+from collections import deque
+from typing import Iterator, NamedTuple
+from fastfingertips.cache_utils import memoize
+
+# Compiled pattern behind is_valid_email, for callers that match many values
+EMAIL_PATTERN = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
 
 
 def extract_pattern(text: str, pattern: str, group: int = 1) -> str | None:
@@ -148,8 +157,7 @@ def is_valid_email(value: str) -> bool:
     if not value or not isinstance(value, str):
         return False
     
-    email_pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-    return bool(re.match(email_pattern, value))
+    return EMAIL_PATTERN.match(value) is not None
 
 
 def is_boolean(value) -> bool:
@@ -195,3 +203,117 @@ def is_positive_float(value) -> bool:
         return number > 0
     except (ValueError, TypeError):
         return False
+
+
+# Memoized variants for pipelines that see the same inputs repeatedly.
+# Each exposes cache_info() and cache_clear().
+slugify_cached = memoize(maxsize=4096)(slugify)
+extract_year_cached = memoize(maxsize=4096)(extract_year)
+
+
+class ScanMatch(NamedTuple):
+    """A match found by scan_file: its kind, decoded text and byte offset in the file."""
+    kind: str
+    value: str
+    offset: int
+
+
+# Byte patterns for scan_file. Lengths are capped so that no match can be
+# longer than the overlap between chunks, which keeps chunked results exact.
+SCAN_PATTERNS = {
+    "url": rb"https?://[^\s\"'<>()\[\]{}]{1,2040}",
+    "email": rb"[\w.-]{1,64}@[\w.-]{1,250}\.\w{1,63}",
+    "year": rb"\b(?:19\d{2}|20[0-3]\d)\b",
+}
+_SCAN_OVERLAP = 4096
+
+
+def _compile_scanner(kinds: tuple[str, ...]) -> re.Pattern:
+    unknown = set(kinds) - set(SCAN_PATTERNS)
+    if unknown:
+        raise ValueError(f"Unknown scan kinds: {sorted(unknown)}")
+    return re.compile(b"|".join(b"(?P<%s>%s)" % (kind.encode(), SCAN_PATTERNS[kind]) for kind in kinds))
+
+
+def _scan_range(path: str, kinds: tuple[str, ...], start: int, end: int | None, chunk_size: int) -> Iterator[ScanMatch]:
+    """Yield matches that start within [start, end) of the file."""
+    pattern = _compile_scanner(kinds)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        end = size if end is None else min(end, size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            chunk_start = start
+            while chunk_start < end:
+                chunk_end = min(chunk_start + chunk_size, end)
+                # Start early to resynchronise on tokens that straddle the boundary,
+                # and read past the end so matches starting in this chunk are complete
+                search_start = max(chunk_start - _SCAN_OVERLAP, 0)
+                search_end = min(chunk_end + _SCAN_OVERLAP, size)
+                for match in pattern.finditer(mm, search_start, search_end):
+                    offset = match.start()
+                    if offset < chunk_start:
+                        continue
+                    if offset >= chunk_end:
+                        break
+                    yield ScanMatch(match.lastgroup, match.group().decode("utf-8", "replace"), offset)
+                chunk_start = chunk_end
+
+
+def _scan_range_list(path: str, kinds: tuple[str, ...], start: int, end: int, chunk_size: int) -> list[ScanMatch]:
+    return list(_scan_range(path, kinds, start, end, chunk_size))
+
+
+def _scan_parallel(path: str, kinds: tuple[str, ...], chunk_size: int, workers: int) -> Iterator[ScanMatch]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = os.path.getsize(path)
+    starts = iter(range(0, size, chunk_size))
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # One chunk per task and a bounded window of tasks in flight, so at most
+        # a few chunks' worth of matches are held in memory at once
+        pending = deque()
+        for start in itertools.islice(starts, 2 * workers):
+            pending.append(executor.submit(_scan_range_list, path, kinds, start, start + chunk_size, chunk_size))
+        while pending:
+            matches = pending.popleft().result()
+            for start in itertools.islice(starts, 1):
+                pending.append(executor.submit(_scan_range_list, path, kinds, start, start + chunk_size, chunk_size))
+            yield from matches
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def scan_file(path: str, kinds: tuple[str, ...] = ("url", "email", "year"), chunk_size: int = 16 * 1024 * 1024,
+              workers: int = 1) -> Iterator[ScanMatch]:
+    """
+    Scan a (possibly multi-GB) file for URLs, emails and years in one pass.
+
+    The file is memory-mapped and searched chunk by chunk with a single
+    combined regex, so it is never read into memory as a whole. Matches that
+    span chunk boundaries are found exactly once.
+
+    Args:
+        path: File to scan
+        kinds: Match kinds to look for (keys of SCAN_PATTERNS)
+        chunk_size: Bytes searched per step
+        workers: If > 1, scan chunks in that many processes, keeping at most
+                 2 * workers chunks in flight
+
+    Returns:
+        Iterator of ScanMatch(kind, value, offset) in file order
+
+    Raises:
+        ValueError: If kinds contains an unknown kind (raised by the call itself)
+
+    Examples:
+        >>> next(scan_file("dump.html", kinds=("email",)))
+        ScanMatch(kind='email', value='user@example.com', offset=1024)
+    """
+    kinds = tuple(kinds)
+    _compile_scanner(kinds)
+    if workers <= 1:
+        return _scan_range(path, kinds, 0, None, chunk_size)
+    return _scan_parallel(path, kinds, chunk_size, workers)
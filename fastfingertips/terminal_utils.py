@@ -1,7 +1,6 @@
 import sys
 import os
 import time
-from termcolor import colored
 
 def setup_encoding():
     """
@@ -73,6 +72,8 @@ def clear_screen() -> None:
 
 def print_status(message: str, success: bool = True) -> None:
     """Print a colored status message to the terminal."""
+    from termcolor import colored
+
     color = "green" if success else "red"
     print(colored(message, color))
 
@@ -88,3 +89,145 @@ def wait_with_progress(seconds: int, message: str = "Waiting") -> None:
         sys.stdout.flush()
         time.sleep(1)
     sys.stdout.write(f"\r{message}: Done!                      \n")
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class ProgressReporter:
+    """
+    Throttled progress and throughput reporter.
+
+    `update()` only counts and checks the clock; the status line is redrawn
+    at most `refresh_rate` times per second on a TTY. When the stream is not
+    a TTY, a plain line is written (or logged) every `log_interval` seconds
+    instead. The line shows the item rate, EWMA throughput, ETA and error
+    count. Not thread-safe: call `update()` from a single thread.
+
+    Examples:
+        >>> for item in track(items, description="Books"):
+        ...     process(item)
+        >>> with ProgressReporter(total=len(urls)) as progress:
+        ...     for url in urls:
+        ...         progress.update(error=not fetch(url))
+    """
+
+    def __init__(self, total: int | None = None, description: str = "Progress", *,
+                 refresh_rate: float = 10.0, log_interval: float = 10.0, smoothing: float = 0.3,
+                 stream=None, logger=None):
+        self.total = total
+        self.description = description
+        self.smoothing = smoothing
+        self.stream = stream or sys.stdout
+        self.logger = logger
+        self.is_tty = logger is None and hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.interval = 1.0 / refresh_rate if self.is_tty else log_interval
+
+        self.count = 0
+        self.errors = 0
+        self.ewma_rate = None
+        self.start_time = time.monotonic()
+        self._last_time = self.start_time
+        self._last_count = 0
+        self._next_draw = self.start_time + self.interval
+        self._closed = False
+
+    def update(self, n: int = 1, error: bool = False) -> None:
+        """Record `n` processed items, optionally counting them as errors."""
+        self.count += n
+        if error:
+            self.errors += n
+        now = time.monotonic()
+        if now >= self._next_draw:
+            self._draw(now)
+
+    def _update_rate(self, now: float) -> None:
+        elapsed = now - self._last_time
+        if elapsed <= 0:
+            return
+        rate = (self.count - self._last_count) / elapsed
+        if self.ewma_rate is None:
+            self.ewma_rate = rate
+        else:
+            self.ewma_rate = self.smoothing * rate + (1 - self.smoothing) * self.ewma_rate
+        self._last_time = now
+        self._last_count = self.count
+
+    def format_status(self, now: float | None = None) -> str:
+        """Return the current status line."""
+        now = time.monotonic() if now is None else now
+        elapsed = now - self.start_time
+        average_rate = self.count / elapsed if elapsed > 0 else 0.0
+        rate = self.ewma_rate if self.ewma_rate is not None else average_rate
+
+        if self.total:
+            percent = min(self.count / self.total, 1.0)
+            bar_length = 20
+            filled_length = int(bar_length * percent)
+            bar = "=" * filled_length + "-" * (bar_length - filled_length)
+            eta = _format_duration((self.total - self.count) / rate) if rate > 0 else "?"
+            position = f"[{bar}] {self.count}/{self.total} {percent:4.0%}"
+            timing = f"ETA {eta}"
+        else:
+            position = f"{self.count}"
+            timing = f"elapsed {_format_duration(elapsed)}"
+
+        return (f"{self.description}: {position} | {rate:.1f} it/s (avg {average_rate:.1f}) "
+                f"| {timing} | errors {self.errors}")
+
+    def _draw(self, now: float, final: bool = False) -> None:
+        self._update_rate(now)
+        self._next_draw = now + self.interval
+        status = self.format_status(now)
+        if self.logger is not None:
+            self.logger.info(status)
+        elif self.is_tty:
+            self.stream.write(f"\r{status}   " + ("\n" if final else ""))
+            self.stream.flush()
+        else:
+            self.stream.write(status + "\n")
+            self.stream.flush()
+
+    def close(self) -> None:
+        """Draw the final status line."""
+        if self._closed:
+            return
+        self._closed = True
+        self._draw(time.monotonic(), final=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def wrap(self, iterable):
+        """Yield items from `iterable`, counting each one, and close when exhausted."""
+        try:
+            for item in iterable:
+                yield item
+                self.update()
+        finally:
+            self.close()
+
+
+def track(iterable, total: int | None = None, description: str = "Progress", **kwargs):
+    """
+    Wrap an iterable with a throttled `ProgressReporter`.
+
+    Args:
+        iterable: Items to iterate over
+        total: Number of items (default: len(iterable) if available)
+        description: Label shown before the progress bar
+        **kwargs: Extra options for ProgressReporter
+
+    Returns:
+        Generator yielding the items of `iterable`
+    """
+    if total is None and hasattr(iterable, "__len__"):
+        total = len(iterable)
+    return ProgressReporter(total, description, **kwargs).wrap(iterable)
@@ -1,4 +1,6 @@
 from urllib.parse import urlparse
+from fastfingertips.cache_utils import memoize
+from fastfingertips.string_utils import scan_file
 
 
 def is_valid_url(url: str) -> bool:
@@ -205,3 +207,27 @@ def urls_match(url1: str, url2: str, ignore_trailing_slash: bool = True, symmetr
             return url1 == url2 or f'{url1}/' == url2
     
     return url1 == url2
+
+
+
+def scan_urls(path: str, workers: int = 1, valid_only: bool = True):
+    """
+    Scan a large file for http(s) URLs without loading it into memory.
+
+    Args:
+        path: File to scan
+        workers: Number of processes to split the file across
+        valid_only: Skip matches that is_valid_url rejects
+
+    Returns:
+        Iterator of ScanMatch(kind, value, offset) in file order
+    """
+    for match in scan_file(path, kinds=("url",), workers=workers):
+        if not valid_only or is_valid_url(match.value):
+            yield match
+
+
+# Memoized variants for pipelines that see the same URLs repeatedly.
+# Each exposes cache_info() and cache_clear().
+urlparse_cached = memoize(maxsize=4096)(urlparse)
+is_valid_url_cached = memoize(maxsize=4096)(is_valid_url)
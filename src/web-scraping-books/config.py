@@ -3,3 +3,24 @@ JSON_FOLDER_PATH = "./generated/json/"
 IMAGES_FOLDER_PATH = "./generated/images/"
 # URL to scrape
 URL = "https://www.camelcodes.net/books/"
+# Seconds allowed for each HTTP request before it is abandoned
+REQUEST_TIMEOUT = 30
+# Images larger than these limits are skipped before being fully downloaded or decoded
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000
+# Parse listing pages incrementally while they download, instead of building the whole DOM first
+STREAM_PARSING = False
+# Worker processes for HTML parsing (0 parses in the main process)
+PARSE_WORKERS = 0
+# Storage backend for scraped books: "json" rewrites books.json, "sqlite" upserts into SQLITE_DB_PATH
+STORAGE_BACKEND = "json"
+SQLITE_DB_PATH = "./generated/books.db"
+# Stage profiler: capture per-stage peak memory with tracemalloc, and write the JSON report here (None to skip)
+PROFILE_MEMORY = False
+PROFILE_REPORT_PATH = None
+# Daemon mode (daemon.py): HTTP address, optional Unix socket path, concurrent jobs and finished jobs kept for status queries
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8765
+DAEMON_SOCKET = None
+DAEMON_WORKERS = 4
+DAEMON_JOB_HISTORY = 500
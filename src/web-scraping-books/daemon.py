@@ -0,0 +1,385 @@
+"""
+Long-running scraper daemon.
+
+Keeps the interpreter, imports, HTTP connections, the parse pool and the
+thumbnail store warm between jobs, and accepts scrape jobs over HTTP on
+DAEMON_HOST:DAEMON_PORT (or a Unix socket, DAEMON_SOCKET).
+
+Endpoints:
+    POST /jobs        {"url": "..." or [...], "output": "books.json" or "sqlite:books.db",
+                       "streaming": false, "parse_pool": false}  -> 202 {"id": ..., "status": "queued"}
+    GET  /jobs        all known jobs, newest first
+    GET  /jobs/<id>   status, counts, error and stage timings of one job
+    GET  /metrics     daemon-wide counters
+    GET  /health
+
+Usage:
+    python daemon.py [--host H] [--port P] [--socket PATH] [--workers N] [--parse-workers N]
+    python daemon.py submit URL [--output PATH] [--streaming] [--wait]
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import requests
+from config import (
+    JSON_FOLDER_PATH, IMAGES_FOLDER_PATH, SQLITE_DB_PATH, STREAM_PARSING, PARSE_WORKERS, PROFILE_MEMORY,
+    DAEMON_HOST, DAEMON_PORT, DAEMON_SOCKET, DAEMON_WORKERS, DAEMON_JOB_HISTORY,
+)
+from main import BookScraper
+from utils.file_utils import create_folder_if_not_exists
+from utils.image_store import ImageStore
+from utils.parse_pool import ParsePool
+from utils.storage import SqliteBookStore
+from utils.timing_utils import Profiler
+
+JOB_STATES = ('queued', 'running', 'succeeded', 'failed')
+
+class Job:
+    """One scrape request and its outcome."""
+
+    def __init__(self, urls, output, target, streaming, use_parse_pool):
+        self.id = uuid.uuid4().hex[:12]
+        self.urls = urls
+        self.output = output
+        # ('json' or 'sqlite', resolved Path)
+        self.target = target
+        self.streaming = streaming
+        self.use_parse_pool = use_parse_pool
+        self.status = 'queued'
+        self.error = None
+        self.books = 0
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.stages = []
+        # The worker updates a job while handler threads serialise it
+        self._lock = threading.Lock()
+
+    def update(self, **changes):
+        """Sets several fields at once, so readers never see a half-updated job."""
+        with self._lock:
+            for name, value in changes.items():
+                setattr(self, name, value)
+
+    def to_dict(self, with_stages=False):
+        with self._lock:
+            return self._to_dict(with_stages)
+
+    def _to_dict(self, with_stages):
+        data = {
+            'id': self.id,
+            'status': self.status,
+            'urls': self.urls,
+            'output': self.output,
+            'streaming': self.streaming,
+            'parse_pool': self.use_parse_pool,
+            'books': self.books,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'queue_seconds': (self.started_at or time.time()) - self.submitted_at,
+            'run_seconds': (self.finished_at or time.time()) - self.started_at if self.started_at else None,
+        }
+        if with_stages:
+            data['stages'] = self.stages
+        return data
+
+class ScraperDaemon:
+    """
+    Runs BookScraper jobs concurrently on a thread pool, with warm shared state.
+
+    Shared between jobs: one requests.Session per worker thread (so
+    connections stay open between jobs), the optional parse pool and the
+    content-addressed ImageStore. Each job gets its own BookScraper,
+    Profiler and output store, so a failing job cannot affect the others.
+    """
+
+    def __init__(self, workers=DAEMON_WORKERS, parse_workers=PARSE_WORKERS, image_path=IMAGES_FOLDER_PATH,
+                 json_path=JSON_FOLDER_PATH, sqlite_folder=Path(SQLITE_DB_PATH).parent, history=DAEMON_JOB_HISTORY):
+        self.image_path = image_path
+        self.json_path = json_path
+        self.sqlite_folder = sqlite_folder
+        self.history = history
+        self.image_store = ImageStore(image_path)
+        self.parse_pool = ParsePool(parse_workers) if parse_workers else None
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrape-job')
+        self.jobs = OrderedDict()
+        self.started_at = time.time()
+        self.counters = {'jobs_submitted': 0, 'books_scraped': 0, 'job_seconds': 0.0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions = []
+        create_folder_if_not_exists(image_path)
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def submit(self, request):
+        """Validates a job request, queues it and returns the Job."""
+        urls = request.get('url')
+        if isinstance(urls, str):
+            urls = [urls]
+        if not isinstance(urls, list) or not urls or \
+                not all(isinstance(url, str) and url.startswith(('http://', 'https://')) for url in urls):
+            raise ValueError('url is required: an http(s) URL or a list of them')
+        output = request.get('output', 'books.json')
+        target = self._resolve_output(output)
+        use_parse_pool = bool(request.get('parse_pool', False))
+        if use_parse_pool and self.parse_pool is None:
+            raise ValueError('parse_pool requested but the daemon was started without parse workers')
+
+        job = Job(urls, output, target, bool(request.get('streaming', STREAM_PARSING)), use_parse_pool)
+        with self._lock:
+            self.jobs[job.id] = job
+            self.counters['jobs_submitted'] += 1
+            self._trim_history()
+        self.executor.submit(self._run, job)
+        return job
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ('succeeded', 'failed')]
+        for job_id in finished[:max(len(self.jobs) - self.history, 0)]:
+            del self.jobs[job_id]
+
+    def _resolve_output(self, output):
+        """
+        Resolves a job's output to ('json' or 'sqlite', Path).
+        Relative paths are taken from json_path (or sqlite_folder for sqlite:PATH),
+        and the result must stay inside that folder.
+        """
+        if not isinstance(output, str) or not output:
+            raise ValueError('output must be a JSON file name or sqlite:PATH')
+        if output.startswith('sqlite:'):
+            kind, folder, name = 'sqlite', self.sqlite_folder, output[len('sqlite:'):]
+        else:
+            kind, folder, name = 'json', self.json_path, output
+        folder = Path(folder).resolve()
+        path = (folder / name).resolve()
+        if folder not in path.parents:
+            raise ValueError(f'output must be a file inside {folder}')
+        return kind, path
+
+    def _open_output(self, target):
+        """Returns (store, json_path, filename) for a job's resolved output."""
+        kind, path = target
+        create_folder_if_not_exists(path.parent)
+        if kind == 'sqlite':
+            return SqliteBookStore(path), self.json_path, 'books.json'
+        return None, str(path.parent) + '/', path.name
+
+    def _run(self, job):
+        job.update(status='running', started_at=time.time())
+        outcome = {}
+        profiler = Profiler(trace_memory=PROFILE_MEMORY)
+        store = None
+        try:
+            store, json_path, filename = self._open_output(job.target)
+            scraper = BookScraper(
+                url=job.urls, json_path=json_path, image_path=self.image_path, store=store, profiler=profiler,
+                image_store=self.image_store, parse_pool=self.parse_pool if job.use_parse_pool else None,
+                streaming=job.streaming, session=self._session(),
+            )
+            scraper.execute(filename)
+            outcome = {'status': 'succeeded', 'books': len(scraper.books)}
+        except Exception as e:
+            outcome = {'status': 'failed', 'error': f'{type(e).__name__}: {e}'}
+        finally:
+            if store is not None:
+                store.close()
+            profiler.stop()
+            # The final status is published together with stages and finished_at
+            job.update(**outcome, stages=profiler.report(), finished_at=time.time())
+            with self._lock:
+                self.counters['books_scraped'] += job.books
+                self.counters['job_seconds'] += job.finished_at - job.started_at
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def metrics(self):
+        """Daemon-wide counters: jobs by status, totals and warm-state sizes."""
+        with self._lock:
+            by_status = dict.fromkeys(JOB_STATES, 0)
+            for job in self.jobs.values():
+                by_status[job.status] += 1
+            counters = dict(self.counters)
+            sessions = len(self._sessions)
+        return {
+            'uptime_seconds': time.time() - self.started_at,
+            'jobs_by_status': by_status,
+            **counters,
+            'http_sessions': sessions,
+            'parse_workers': self.parse_pool.max_workers if self.parse_pool else 0,
+            'image_store_urls': len(self.image_store.urls),
+            'image_store_blobs': len(self.image_store.blobs),
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        for session in self._sessions:
+            session.close()
+        self.image_store.save()
+
+def make_handler(daemon):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send_json(self, status, data):
+            body = json.dumps(data, indent=2).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0].rstrip('/')
+            if path == '/health':
+                return self._send_json(200, {'status': 'ok'})
+            if path == '/metrics':
+                return self._send_json(200, daemon.metrics())
+            if path == '/jobs':
+                return self._send_json(200, daemon.list_jobs())
+            if path.startswith('/jobs/'):
+                job = daemon.get(path[len('/jobs/'):])
+                if job is None:
+                    return self._send_json(404, {'error': 'unknown job'})
+                return self._send_json(200, job.to_dict(with_stages=True))
+            self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path.rstrip('/') != '/jobs':
+                return self._send_json(404, {'error': 'not found'})
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(request, dict):
+                    raise ValueError('request body must be a JSON object')
+                job = daemon.submit(request)
+            except ValueError as e:  # includes JSONDecodeError
+                return self._send_json(400, {'error': str(e)})
+            self._send_json(202, job.to_dict())
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix domain socket."""
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ('local', 0)
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """http.client connection over a Unix domain socket."""
+
+    def __init__(self, socket_path, timeout=30):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+def serve(host=DAEMON_HOST, port=DAEMON_PORT, socket_path=DAEMON_SOCKET, workers=DAEMON_WORKERS,
+          parse_workers=PARSE_WORKERS):
+    """Starts the daemon and serves requests until interrupted."""
+    daemon = ScraperDaemon(workers=workers, parse_workers=parse_workers)
+    handler = make_handler(daemon)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, handler)
+        where = socket_path
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        where = f'http://{host}:{server.server_address[1]}'
+    print(f'Scraper daemon listening on {where} with {workers} job worker(s)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print('Shutting down, waiting for running jobs ...')
+        server.server_close()
+        daemon.close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+def _request(method, path, body=None, host=DAEMON_HOST, port=DAEMON_PORT, socket_path=DAEMON_SOCKET):
+    connection = UnixHTTPConnection(socket_path) if socket_path else http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b'null')
+    finally:
+        connection.close()
+
+def submit(args):
+    """Submits a job to a running daemon and prints its status."""
+    target = {'host': args.host, 'port': args.port, 'socket_path': args.socket}
+    request = {'url': args.url, 'output': args.output, 'streaming': args.streaming, 'parse_pool': args.parse_pool}
+    status, job = _request('POST', '/jobs', request, **target)
+    if status != 202 or not args.wait:
+        print(json.dumps(job, indent=2))
+        return
+    while job['status'] in ('queued', 'running'):
+        time.sleep(0.2)
+        _, job = _request('GET', f"/jobs/{job['id']}", **target)
+    print(json.dumps(job, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=DAEMON_HOST)
+    parser.add_argument('--port', type=int, default=DAEMON_PORT)
+    parser.add_argument('--socket', default=DAEMON_SOCKET, help='listen on (or connect to) this Unix socket instead')
+    subcommands = parser.add_subparsers(dest='command')
+    submit_parser = subcommands.add_parser('submit', help='send a job to a running daemon')
+    submit_parser.add_argument('url', nargs='+')
+    submit_parser.add_argument('--output', default='books.json', help='JSON file, or sqlite:PATH')
+    submit_parser.add_argument('--streaming', action='store_true')
+    submit_parser.add_argument('--parse-pool', action='store_true')
+    submit_parser.add_argument('--wait', action='store_true', help='poll until the job finishes')
+    parser.add_argument('--workers', type=int, default=DAEMON_WORKERS, help='concurrent jobs')
+    parser.add_argument('--parse-workers', type=int, default=PARSE_WORKERS, help='parse pool processes (0 for none)')
+    args = parser.parse_args()
+
+    if args.command == 'submit':
+        submit(args)
+    else:
+        serve(args.host, args.port, args.socket, args.workers, args.parse_workers)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Load benchmark: runs BookScraper against a local FakeCatalogue.
+
+Run from the project folder:
+    python -m loadtest.benchmark --pages 10 --books-per-page 50 --latency 0.02 --runs 2
+
+Each run scrapes every listing page into a temporary folder and reports
+pages/sec, images/sec (covers downloaded from the site), peak RSS and
+the profiler's stage breakdown. Later runs reuse the image store
+of the first one unless --cold is given, so they show the effect of the
+thumbnail cache.
+
+The stand-in site runs in its own process and every run scrapes in a
+fresh child process, so the peak RSS reported is that run's scraper
+alone, not the site's generated pages and images or earlier runs.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from main import BookScraper
+from utils.image_store import ImageStore
+from utils.parse_pool import ParsePool
+from utils.timing_utils import Profiler
+from loadtest.fake_site import FakeCatalogue
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss_bytes():
+    """Peak resident set size of this process and of its finished children (parse workers)."""
+    if resource is None:
+        return None, None
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    )
+
+def scrape_once(page_urls, work_dir, image_dir, parse_workers, streaming, trace_memory, verbose):
+    """Scrapes the catalogue once; runs in a child process of its own."""
+    profiler = Profiler(trace_memory=trace_memory)
+    parse_pool = ParsePool(parse_workers) if parse_workers else None
+    output = io.StringIO()
+    try:
+        scraper = BookScraper(
+            url=page_urls, json_path=str(work_dir / 'json') + '/', image_path=str(image_dir) + '/',
+            profiler=profiler, image_store=ImageStore(image_dir), parse_pool=parse_pool, streaming=streaming,
+        )
+        redirect = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(output)
+        start = time.perf_counter()
+        with redirect:
+            scraper.run()
+        elapsed = time.perf_counter() - start
+    finally:
+        if parse_pool is not None:
+            parse_pool.close()
+
+    rss_self, rss_children = peak_rss_bytes()
+    # BookScraper.run reports failures on stdout instead of raising
+    error = next((line for line in output.getvalue().splitlines() if line.startswith('An error occurred')), None)
+    return {
+        'seconds': elapsed,
+        'books': len(scraper.books),
+        'thumbnails': sum(1 for book in scraper.books if book.thumbnail_image not in ('no_image.jpg', 'error_image.jpg')),
+        'peak_rss_bytes': rss_self,
+        'peak_rss_children_bytes': rss_children if parse_workers else None,
+        'error': error,
+        'stages': profiler.report(),
+        'stage_table': profiler.format_table(),
+    }
+
+class SiteProcess:
+    """Runs loadtest.fake_site in a subprocess and talks to its stats endpoint."""
+
+    def __init__(self, args):
+        self.pages = args.pages
+        command = [
+            sys.executable, '-m', 'loadtest.fake_site', '--port', '0',
+            '--pages', str(args.pages), '--books-per-page', str(args.books_per_page),
+            '--image-size', args.image_size, '--latency', str(args.latency), '--jitter', str(args.jitter),
+            '--error-rate', str(args.error_rate), '--image-error-rate', str(args.image_error_rate),
+            '--seed', str(args.seed),
+        ]
+        if args.distinct_images:
+            command += ['--distinct-images', str(args.distinct_images)]
+        self.process = subprocess.Popen(command, cwd=PROJECT_DIR, stdout=subprocess.PIPE, text=True)
+        line = self.process.stdout.readline()
+        match = re.search(r'(http://[^/\s]+)/books/', line)
+        if match is None:
+            self.stop()
+            raise RuntimeError(f'Fake site did not start: {line!r}')
+        self.base_url = match.group(1)
+        self.page_urls = FakeCatalogue.listing_urls(self.base_url, self.pages)
+
+    def stats(self):
+        with urllib.request.urlopen(self.base_url + '/_stats') as response:
+            return json.load(response)
+
+    def reset_stats(self):
+        urllib.request.urlopen(urllib.request.Request(self.base_url + '/_stats/reset', data=b'', method='POST')).close()
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def run_once(site, work_dir, image_dir, parse_workers, streaming, trace_memory, verbose):
+    """Scrapes the site once in a fresh child process and returns the measurements."""
+    site.reset_stats()
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        result = executor.submit(
+            scrape_once, site.page_urls, work_dir, image_dir, parse_workers, streaming, trace_memory, verbose,
+        ).result()
+    stats = site.stats()
+    elapsed = result['seconds']
+    result.update({
+        'pages_served': stats['pages'],
+        'images_served': stats['images'],
+        'errors_injected': stats['errors'],
+        'bytes_served': stats['bytes'],
+        'pages_per_sec': len(site.page_urls) / elapsed,
+        'images_per_sec': stats['images'] / elapsed,
+        'books_per_sec': result['books'] / elapsed,
+    })
+    return result
+
+def format_summary(index, result):
+    rss = result['peak_rss_bytes']
+    rss_text = f'{rss / 2**20:.1f} MiB' if rss is not None else 'n/a'
+    if result['peak_rss_children_bytes']:
+        rss_text += f" (workers {result['peak_rss_children_bytes'] / 2**20:.1f} MiB)"
+    return '\n'.join([
+        f"Run {index}: {result['seconds']:.2f} s, {result['books']} books, "
+        f"{result['images_served']} images downloaded, {result['errors_injected']} injected errors",
+        f"  pages/sec {result['pages_per_sec']:.2f}   images/sec {result['images_per_sec']:.2f}   "
+        f"books/sec {result['books_per_sec']:.2f}   peak RSS {rss_text}",
+        *([f"  {result['error']}"] if result['error'] else []),
+        result['stage_table'],
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--books-per-page', type=int, default=50)
+    parser.add_argument('--image-size', default='800x600', help='cover size as WIDTHxHEIGHT')
+    parser.add_argument('--distinct-images', type=int, default=None, help='number of distinct covers (default: one per book)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random delay, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of page requests answered with HTTP 500')
+    parser.add_argument('--image-error-rate', type=float, default=0.0, help='fraction of image requests answered with HTTP 500')
+    parser.add_argument('--parse-workers', type=int, default=0)
+    parser.add_argument('--streaming', action='store_true', help='parse listing pages while they download')
+    parser.add_argument('--trace-memory', action='store_true', help='record per-stage peak memory (slower)')
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--cold', action='store_true', help='start every run with an empty image store')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', dest='json_path', help='write the results to this file')
+    parser.add_argument('--verbose', action='store_true', help="show the scraper's own output")
+    args = parser.parse_args()
+
+    results = []
+    with SiteProcess(args) as site, tempfile.TemporaryDirectory(prefix='scraper-loadtest-') as tmp:
+        print(f'Serving {args.pages} page(s) x {args.books_per_page} books at {site.base_url}')
+        for index in range(1, args.runs + 1):
+            work_dir = Path(tmp) / f'run{index}'
+            image_dir = work_dir / 'images' if args.cold else Path(tmp) / 'images'
+            result = run_once(
+                site, work_dir, image_dir, args.parse_workers, args.streaming, args.trace_memory, args.verbose,
+            )
+            results.append(result)
+            print(format_summary(index, result))
+
+    if args.json_path:
+        settings = {key: value for key, value in vars(args).items() if key != 'json_path'}
+        runs = [{key: value for key, value in result.items() if key != 'stage_table'} for result in results]
+        with open(args.json_path, 'w', encoding='utf-8') as json_file:
+            json.dump({'settings': settings, 'runs': runs}, json_file, indent=4)
+
+if __name__ == '__main__':
+    main()
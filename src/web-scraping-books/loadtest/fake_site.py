@@ -0,0 +1,237 @@
+import argparse
+import io
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PIL import Image
+
+WORDS = [
+    'clean', 'code', 'pragmatic', 'programmer', 'design', 'patterns', 'refactoring', 'domain',
+    'driven', 'systems', 'data', 'intensive', 'applications', 'python', 'tricks', 'effective',
+]
+
+class FakeCatalogue:
+    """
+    Local stand-in for the books site, serving synthetic listing pages and images.
+
+    Listing pages are at `/books/` and `/books/page/<n>/`, each with
+    `books_per_page` `kg-product-card` containers laid out like the real
+    page. Book covers are JPEGs of `image_size` served from `/images/<n>.jpg`;
+    `distinct_images` books share covers when it is smaller than the number
+    of books, so image deduplication can be exercised. Every request can be
+    delayed by `latency` seconds (plus up to `jitter`) and fail with HTTP 500
+    at `error_rate` (pages) or `image_error_rate` (images). Pages and images
+    are generated once, before the server starts, from `seed`.
+
+    `GET /_stats` returns the request counters as JSON and `POST /_stats/reset`
+    zeroes them, so a benchmark can drive a site running in another process.
+    """
+
+    def __init__(self, pages=1, books_per_page=50, image_size=(800, 600), distinct_images=None,
+                 latency=0.0, jitter=0.0, error_rate=0.0, image_error_rate=0.0, seed=0,
+                 host='127.0.0.1', port=0):
+        self.pages = pages
+        self.books_per_page = books_per_page
+        self.image_size = image_size
+        self.distinct_images = distinct_images or pages * books_per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.image_error_rate = image_error_rate
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self.stats = {'pages': 0, 'images': 0, 'errors': 0, 'bytes': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._images = {}
+        self._page_templates = {}
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f'http://{self.host}:{self.port}'
+
+    @property
+    def page_urls(self):
+        """URLs of every listing page, in order."""
+        return self.listing_urls(self.base_url, self.pages)
+
+    @staticmethod
+    def _page_path(page):
+        return '/books/' if page == 1 else f'/books/page/{page}/'
+
+    @classmethod
+    def listing_urls(cls, base_url, pages):
+        """URLs of the listing pages of a catalogue served at base_url."""
+        return [base_url + cls._page_path(page) for page in range(1, pages + 1)]
+
+    def _generate_images(self):
+        rng = random.Random(self.seed)
+        for image_id in range(self.distinct_images):
+            color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            image = Image.new('RGB', self.image_size, color)
+            # A few shapes so covers do not compress to almost nothing
+            for _ in range(8):
+                x, y = rng.randrange(self.image_size[0]), rng.randrange(self.image_size[1])
+                box = (x, y, min(x + self.image_size[0] // 4, self.image_size[0]), min(y + self.image_size[1] // 4, self.image_size[1]))
+                image.paste((rng.randrange(256), rng.randrange(256), rng.randrange(256)), box)
+            buffer = io.BytesIO()
+            image.save(buffer, 'JPEG', quality=85)
+            self._images[f'/images/{image_id}.jpg'] = buffer.getvalue()
+
+    def _book_card(self, book_id, rng):
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).title()
+        rating = rng.randint(0, 5)
+        stars = ''.join(
+            f'<span class="kg-product-card-rating-star{" kg-product-card-rating-active" if star < rating else ""}">&#9733;</span>'
+            for star in range(5)
+        )
+        description = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 60)))
+        image_id = book_id % self.distinct_images
+        return (
+            '<div class="kg-card kg-product-card"><div class="kg-product-card-container">'
+            f'<img src="{{base}}/images/{image_id}.jpg" class="kg-product-card-image" loading="lazy">'
+            f'<div class="kg-product-card-title-container"><h4 class="kg-product-card-title">{title} #{book_id}</h4></div>'
+            f'<div class="kg-product-card-rating">{stars}</div>'
+            f'<div class="kg-product-card-description"><p>{description}</p></div>'
+            f'<a href="https://shop.example.com/books/{book_id}?ref=catalogue" class="kg-product-card-button kg-product-card-btn-accent">'
+            '<span>Buy</span></a></div></div>'
+        )
+
+    def _generate_pages(self):
+        rng = random.Random(self.seed)
+        for page in range(1, self.pages + 1):
+            first = (page - 1) * self.books_per_page
+            cards = ''.join(self._book_card(book_id, rng) for book_id in range(first, first + self.books_per_page))
+            self._page_templates[self._page_path(page)] = (
+                '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Books</title></head>'
+                f'<body><main class="gh-main"><article>{cards}</article></main></body></html>'
+            )
+
+    def _should_fail(self, rate):
+        if not rate:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def _delay(self):
+        if self.latency or self.jitter:
+            with self._lock:
+                extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+            time.sleep(self.latency + extra)
+
+    def _count(self, key, size=0):
+        with self._lock:
+            self.stats[key] += 1
+            self.stats['bytes'] += size
+
+    def _make_handler(self):
+        catalogue = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/_stats':
+                    with catalogue._lock:
+                        body = json.dumps(catalogue.stats).encode('utf-8')
+                    return self._send(body, 'application/json')
+                catalogue._delay()
+                if path in catalogue._page_templates:
+                    if catalogue._should_fail(catalogue.error_rate):
+                        return self._error()
+                    body = catalogue._page_templates[path].replace('{base}', catalogue.base_url).encode('utf-8')
+                    catalogue._count('pages', len(body))
+                    return self._send(body, 'text/html; charset=utf-8')
+                if path in catalogue._images:
+                    if catalogue._should_fail(catalogue.image_error_rate):
+                        return self._error()
+                    body = catalogue._images[path]
+                    catalogue._count('images', len(body))
+                    return self._send(body, 'image/jpeg')
+                self.send_error(404)
+
+            def do_POST(self):
+                if self.path != '/_stats/reset':
+                    return self.send_error(404)
+                catalogue.reset_stats()
+                self._send(b'{}', 'application/json')
+
+            def _send(self, body, content_type):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self):
+                catalogue._count('errors')
+                self.send_error(500, 'Injected error')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Generates the content and serves it from a background thread."""
+        self._generate_images()
+        self._generate_pages()
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-catalogue', daemon=True)
+        self._thread.start()
+        return self
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic books catalogue for local testing.')
+    parser.add_argument('--pages', type=int, default=1)
+    parser.add_argument('--books-per-page', type=int, default=50)
+    parser.add_argument('--image-size', default='800x600', help='cover size as WIDTHxHEIGHT')
+    parser.add_argument('--distinct-images', type=int, default=None)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random delay, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--image-error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--port', type=int, default=8000, help='0 picks a free port')
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.image_size.split('x'))
+    catalogue = FakeCatalogue(
+        pages=args.pages, books_per_page=args.books_per_page, image_size=(width, height),
+        distinct_images=args.distinct_images, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, image_error_rate=args.image_error_rate, seed=args.seed, port=args.port,
+    )
+    with catalogue:
+        # benchmark.py reads the address from this line
+        print(f'Serving {args.pages} page(s) at {catalogue.page_urls[0]} (Ctrl+C to stop)', flush=True)
+        try:
+            catalogue._thread.join()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == '__main__':
+    main()
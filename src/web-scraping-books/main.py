@@ -1,17 +1,36 @@
+import hashlib
 from pathlib import Path
-from config import JSON_FOLDER_PATH, IMAGES_FOLDER_PATH, URL
+from config import (
+    JSON_FOLDER_PATH, IMAGES_FOLDER_PATH, URL, STORAGE_BACKEND, SQLITE_DB_PATH,
+    PROFILE_MEMORY, PROFILE_REPORT_PATH, REQUEST_TIMEOUT, MAX_IMAGE_BYTES, MAX_IMAGE_PIXELS,
+    PARSE_WORKERS, STREAM_PARSING,
+)
 from utils.file_utils import save_json_file, create_folder_if_not_exists, get_file_path
-from utils.web_utils import fetch_html_content
-from utils.data_extractors import extract_book_raw_data
-from utils.image_utils import fetch_image_content, process_and_save_image
-from utils.timing_utils import Timer
+from utils.web_utils import fetch_html_content, fetch_html_bytes
+from utils.data_extractors import BOOK_CONTAINER_CLASS, extract_book_raw_data, extract_books_from_html
+from utils.image_utils import fetch_image_to_file, process_and_save_image
+from utils.timing_utils import Profiler
+from utils.storage import SqliteBookStore
+from utils.image_store import ImageStore
+from utils.parse_pool import ParsePool
+from utils.stream_extractor import iter_book_records
 from models.book import Book
 
 class BookScraper:
-    def __init__(self, url=URL, json_path=JSON_FOLDER_PATH, image_path=IMAGES_FOLDER_PATH):
-        self.url = url
+    def __init__(self, url=URL, json_path=JSON_FOLDER_PATH, image_path=IMAGES_FOLDER_PATH, store=None,
+                 profiler=None, image_store=None, parse_pool=None, streaming=STREAM_PARSING, session=None):
+        # A single listing URL or a list of them
+        self.urls = [url] if isinstance(url, str) else list(url)
+        self.url = self.urls[0]
         self.json_path = json_path
         self.image_path = image_path
+        self.store = store
+        self.image_store = image_store or ImageStore(image_path)
+        self.profiler = profiler or Profiler(trace_memory=PROFILE_MEMORY)
+        self.parse_pool = parse_pool
+        self.streaming = streaming
+        # Optional requests.Session, so repeated scrapes reuse open connections
+        self.session = session
         self.books = []
 
     def _prepare_environment(self):
@@ -24,30 +43,84 @@ class BookScraper:
         if not image_url:
             return "no_image.jpg"
             
+        # Known URL: reuse the stored thumbnail without downloading
+        stored_path = self.image_store.lookup_url(image_url)
+        if stored_path:
+            return stored_path
+
         try:
-            content = fetch_image_content(image_url)
-            filename = Path(image_url).name
-            save_path = get_file_path(self.image_path, filename)
-            return process_and_save_image(content, save_path)
+            hasher = hashlib.sha256()
+            with self.profiler.stage('download'):
+                image_file = fetch_image_to_file(
+                    image_url, max_bytes=MAX_IMAGE_BYTES, timeout=REQUEST_TIMEOUT, hasher=hasher,
+                    session=self.session,
+                )
+            with image_file:
+                def create_thumbnail(save_path):
+                    with self.profiler.stage('resize'):
+                        process_and_save_image(image_file, save_path, max_pixels=MAX_IMAGE_PIXELS)
+
+                # Identical bytes already stored under another URL skip the resize
+                return self.image_store.add(image_url, hasher.hexdigest(), create_thumbnail)
         except Exception as e:
             print(f"Failed to process image {image_url}: {e}")
             return "error_image.jpg"
 
+    def _extract_records(self):
+        """Fetches and parses each listing page in this process, yielding raw book data."""
+        for url in self.urls:
+            print(f'Downloading html page: {url} ...')
+            with self.profiler.stage('fetch'):
+                soup = fetch_html_content(url, timeout=REQUEST_TIMEOUT, session=self.session)
+            with self.profiler.stage('parse'):
+                book_containers = soup.find_all('div', class_=BOOK_CONTAINER_CLASS)
+                records = [extract_book_raw_data(container) for container in book_containers]
+            yield from records
+
+    def _extract_records_in_pool(self):
+        """Fetches each listing page and parses it in the parse pool, yielding raw book data."""
+        futures = []
+        for url in self.urls:
+            print(f'Downloading html page: {url} ...')
+            with self.profiler.stage('fetch'):
+                html = fetch_html_bytes(url, timeout=REQUEST_TIMEOUT, session=self.session)
+            futures.append(self.parse_pool.submit(html, extract_books_from_html))
+
+        for future in futures:
+            # Only the time spent waiting on the workers shows up here
+            with self.profiler.stage('parse'):
+                records = future.result()
+            yield from records
+
+    def _extract_records_streaming(self):
+        """Streams each listing page, yielding raw book data as each container arrives."""
+        for url in self.urls:
+            print(f'Streaming html page: {url} ...')
+            records = iter_book_records(url, timeout=REQUEST_TIMEOUT, session=self.session)
+            while True:
+                # Time only the fetching and parsing, not the consumer's work between records
+                with self.profiler.stage('stream'):
+                    raw_data = next(records, None)
+                if raw_data is None:
+                    break
+                yield raw_data
+
     def scrape(self):
         """Orchestrates the scraping and object creation process."""
-        print(f'Downloading html page: {self.url} ...')
-        soup = fetch_html_content(self.url)
-        book_containers = soup.find_all('div', class_='kg-product-card-container')
-        
+        if self.streaming:
+            records = self._extract_records_streaming()
+        elif self.parse_pool is not None:
+            records = self._extract_records_in_pool()
+        else:
+            records = self._extract_records()
+
         self.books = []
-        for container in book_containers:
-            # 1. Extract raw data (Pure parsing)
-            raw_data = extract_book_raw_data(container)
-            
-            # 2. Process image (I/O Side Effect managed by Scraper)
-            thumbnail_name = self._process_book_image(raw_data['image_url'])
+        for raw_data in records:
+            # Process image (I/O Side Effect managed by Scraper)
+            with self.profiler.stage('image'):
+                thumbnail_name = self._process_book_image(raw_data['image_url'])
             
-            # 3. Create Book Model instance
+            # Create Book Model instance
             book = Book(
                 title=raw_data['title'],
                 rating=raw_data['rating'],
@@ -58,33 +131,66 @@ class BookScraper:
             )
             self.books.append(book)
             
+        self.image_store.save()
         return self.books
 
     def save(self, filename='books.json'):
-        """Saves the scraped data to a JSON file."""
+        """Saves the scraped data to the configured store, or to a JSON file."""
         if not self.books:
             print("No data to save. Run scrape() first.")
             return
 
+        if self.store is not None:
+            print(f'Upserting {len(self.books)} books into {self.store} ...')
+            self.store.upsert_many(self.books)
+            return
+
         scraped_data = [book.to_dict() for book in self.books]
         full_path = get_file_path(self.json_path, filename)
         
         print(f'Writing JSON file to {full_path} ...')
         save_json_file(scraped_data, file_path=full_path)
 
-    def run(self):
-        """Runs the full pipeline with timing."""
-        try:
-            with Timer():
+    def execute(self, filename='books.json'):
+        """Runs the full pipeline under the profiler, letting errors propagate."""
+        with self.profiler.stage('run'):
+            with self.profiler.stage('prepare'):
                 self._prepare_environment()
+            with self.profiler.stage('scrape'):
                 self.scrape()
-                self.save()
+            with self.profiler.stage('save'):
+                self.save(filename)
+
+    def run(self):
+        """Runs the full pipeline and prints a per-stage timing report."""
+        try:
+            self.execute()
         except Exception as e:
             print(f"An error occurred during execution: {e}")
+        finally:
+            self.profiler.stop()
+            print(self.profiler.format_table())
+            if PROFILE_REPORT_PATH:
+                self.profiler.to_json(PROFILE_REPORT_PATH)
+
+def create_store():
+    """Creates the storage backend selected in config, or None for plain JSON."""
+    if STORAGE_BACKEND == 'sqlite':
+        create_folder_if_not_exists(Path(SQLITE_DB_PATH).parent)
+        return SqliteBookStore(SQLITE_DB_PATH)
+    return None
 
 def main():
-    scraper = BookScraper()
-    scraper.run()
+    store = create_store()
+    parse_pool = ParsePool(PARSE_WORKERS) if PARSE_WORKERS else None
+    try:
+        scraper = BookScraper(store=store, parse_pool=parse_pool)
+        scraper.run()
+    finally:
+        if parse_pool is not None:
+            parse_pool.close()
+        if store is not None:
+            store.close()
 
 if __name__ == '__main__':
     print('Booting up...')
@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from typing import Optional
@@ -16,6 +17,12 @@ class Book:
         if self.last_update_date is None:
             self.last_update_date = datetime.now().isoformat()
 
+    @property
+    def key(self):
+        """Stable identifier for the book, based on its buy link or title."""
+        source = self.buy_link.split('?')[0] if self.buy_link else self.title.strip().lower()
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
     def to_dict(self):
         """Converts the Book instance to a dictionary for JSON serialization."""
         return asdict(self)
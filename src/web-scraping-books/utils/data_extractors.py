@@ -1,3 +1,5 @@
+from bs4 import BeautifulSoup
+
 def get_text_or_default(tag, default=''):
     """Extract text from a BeautifulSoup tag or return default."""
     return tag.text.strip() if tag else default
@@ -29,3 +31,50 @@ def extract_book_raw_data(book_container):
         'image_url': get_image_url(image_tag),
         'buy_link': get_link(buy_link_tag)
     }
+
+BOOK_CONTAINER_CLASS = 'kg-product-card-container'
+
+def extract_books_from_html(html):
+    """
+    Parses a listing page and returns the raw data of every book on it.
+    Takes raw HTML bytes or text, so it can run in a parse worker process.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    return [
+        extract_book_raw_data(container)
+        for container in soup.find_all('div', class_=BOOK_CONTAINER_CLASS)
+    ]
+
+class SchemaExtractor:
+    """
+    Extracts records from HTML according to a simple schema.
+
+    `fields` maps each output key to a `(tag, class_, attribute)` tuple;
+    attribute None takes the element's text. Instances are picklable, so they
+    can be sent to a parse pool like a plain function.
+
+    Example:
+        SchemaExtractor('div', 'kg-product-card-container', {
+            'title': ('h4', 'kg-product-card-title', None),
+            'image_url': ('img', 'kg-product-card-image', 'src'),
+        })
+    """
+
+    def __init__(self, container_tag, container_class, fields):
+        self.container_tag = container_tag
+        self.container_class = container_class
+        self.fields = fields
+
+    def __call__(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        records = []
+        for container in soup.find_all(self.container_tag, class_=self.container_class):
+            record = {}
+            for key, (tag, class_, attribute) in self.fields.items():
+                element = container.find(tag, class_=class_)
+                if attribute is None:
+                    record[key] = get_text_or_default(element)
+                else:
+                    record[key] = element.get(attribute, '') if element else ''
+            records.append(record)
+        return records
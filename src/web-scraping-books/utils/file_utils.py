@@ -1,14 +1,24 @@
 from pathlib import Path
 import json
+import os
+import tempfile
 
 def save_json_file(data, file_path):
     """
     Save data to a JSON file.
-    Expects the directory to already exist.
+    Expects the directory to already exist. The data is written to a temporary
+    file that then replaces the target, so readers and concurrent writers never
+    see a partly written file.
     """
     path = Path(file_path)
-    with path.open('w', encoding='utf-8') as json_file:
-        json.dump(data, json_file, indent=4)
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with open(fd, 'w', encoding='utf-8') as json_file:
+            json.dump(data, json_file, indent=4)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
     print(f"Data saved to JSON file {path}")
 
 def create_folder_if_not_exists(folder_path):
@@ -0,0 +1,138 @@
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+class ImageStore:
+    """
+    Content-addressed store for book thumbnails.
+
+    Each thumbnail is stored once, under the SHA-256 of the original image
+    bytes, in a sharded directory (`ab/cd/abcd....jpg`). An index persisted
+    next to the blobs maps every source URL to its hash and counts how many
+    URLs reference each blob, so known URLs skip the download and identical
+    images found at new URLs skip the thumbnail step.
+    """
+
+    def __init__(self, root, index_name='index.json'):
+        self.root = Path(root)
+        self.index_path = self.root / index_name
+        self.urls = {}
+        self.blobs = {}
+        self._lock = threading.Lock()
+        # Digests whose thumbnail is being written, mapped to an event set when it is done
+        self._in_flight = {}
+        # Serializes writers of the index file; concurrent scrapes may share a store
+        self._save_lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        with self.index_path.open('r', encoding='utf-8') as index_file:
+            data = json.load(index_file)
+        self.urls = data.get('urls', {})
+        self.blobs = data.get('blobs', {})
+
+    def save(self):
+        """Writes the index to disk atomically."""
+        with self._save_lock:
+            with self._lock:
+                data = {'urls': dict(self.urls), 'blobs': {digest: dict(blob) for digest, blob in self.blobs.items()}}
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with tmp_path.open('w', encoding='utf-8') as index_file:
+                json.dump(data, index_file, indent=4)
+            os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def relative_path(digest):
+        """Returns the sharded blob path for a content hash, relative to the store root."""
+        return f'{digest[:2]}/{digest[2:4]}/{digest}.jpg'
+
+    def _blob_exists(self, digest):
+        blob = self.blobs.get(digest)
+        return blob is not None and (self.root / blob['path']).exists()
+
+    def lookup_url(self, url):
+        """Returns the stored thumbnail path for a URL seen before, or None."""
+        with self._lock:
+            digest = self.urls.get(url)
+            if digest is not None and self._blob_exists(digest):
+                return self.blobs[digest]['path']
+        return None
+
+    def add(self, url, digest, create_thumbnail):
+        """
+        Records that `url` serves the image with content hash `digest`.
+
+        `create_thumbnail(path)` is only called when no thumbnail exists yet
+        for that content, by one caller at a time per digest. It writes to a
+        temporary file that is then moved into place, so the stored path never
+        holds a partly written image. Returns the thumbnail path relative to
+        the store root.
+        """
+        full_path = self.root / self.relative_path(digest)
+        owner = False
+        while not owner:
+            with self._lock:
+                if full_path.exists():
+                    break
+                done = self._in_flight.get(digest)
+                if done is None:
+                    done = self._in_flight[digest] = threading.Event()
+                    owner = True
+            if not owner:
+                # Another thread is writing this thumbnail; check again once it is done (it may fail)
+                done.wait()
+        if owner:
+            try:
+                self._write_thumbnail(full_path, create_thumbnail)
+            finally:
+                with self._lock:
+                    del self._in_flight[digest]
+                done.set()
+
+        with self._lock:
+            blob = self.blobs.setdefault(digest, {'path': self.relative_path(digest), 'refs': 0})
+            previous = self.urls.get(url)
+            if previous != digest:
+                if previous is not None:
+                    self._decref(previous)
+                self.urls[url] = digest
+                blob['refs'] += 1
+            return blob['path']
+
+    @staticmethod
+    def _write_thumbnail(full_path, create_thumbnail):
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f'.{full_path.stem}.', suffix='.tmp', dir=full_path.parent)
+        os.close(fd)
+        try:
+            create_thumbnail(Path(tmp_path))
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _decref(self, digest):
+        blob = self.blobs.get(digest)
+        if blob is not None:
+            blob['refs'] = max(blob['refs'] - 1, 0)
+
+    def release(self, url):
+        """Forgets a URL, dropping its reference to the stored thumbnail."""
+        with self._lock:
+            digest = self.urls.pop(url, None)
+            if digest is not None:
+                self._decref(digest)
+
+    def collect_garbage(self):
+        """Deletes thumbnails no URL references anymore. Returns how many were removed."""
+        with self._lock:
+            unused = [digest for digest, blob in self.blobs.items() if blob['refs'] <= 0]
+            paths = [self.root / self.blobs.pop(digest)['path'] for digest in unused]
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return len(paths)
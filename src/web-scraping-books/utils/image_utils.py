@@ -1,20 +1,72 @@
+import tempfile
 from pathlib import Path
 import requests
 from PIL import Image
 from io import BytesIO
 
-def fetch_image_content(url):
-    """Fetches raw image content from a URL."""
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.content
+CHUNK_SIZE = 64 * 1024
+# Downloads larger than this are moved from memory to a temporary file
+SPOOL_MAX_SIZE = 1024 * 1024
 
-def process_and_save_image(image_content, save_path, thumbnail_size=(400, 300)):
-    """Resizes an image from raw content and saves it to a path."""
+class ImageTooLargeError(ValueError):
+    """Raised when an image exceeds the configured byte or pixel limits."""
+
+def fetch_image_to_file(url, max_bytes=None, timeout=30, hasher=None, session=None):
+    """
+    Streams an image from a URL into a spooled temporary file.
+
+    The body is read in chunks, small images stay in memory and larger ones
+    spill to disk, so peak memory per download stays bounded. The download
+    is refused up front when Content-Length exceeds `max_bytes`, and aborted
+    as soon as the streamed body does.
+
+    If `hasher` (e.g. `hashlib.sha256()`) is given, it is updated with the
+    body as it streams. Pass a requests `session` to reuse its connections.
+    Returns a file object positioned at the start; the caller closes it.
+    """
+    with (session or requests).get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+
+        content_length = response.headers.get('Content-Length')
+        if max_bytes and content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise ImageTooLargeError(f"Image {url} is {content_length} bytes, limit is {max_bytes}")
+
+        image_file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        try:
+            total = 0
+            for chunk in response.iter_content(CHUNK_SIZE):
+                total += len(chunk)
+                if max_bytes and total > max_bytes:
+                    raise ImageTooLargeError(f"Image {url} exceeds the limit of {max_bytes} bytes")
+                image_file.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+        except BaseException:
+            image_file.close()
+            raise
+
+    image_file.seek(0)
+    return image_file
+
+def process_and_save_image(image_content, save_path, thumbnail_size=(400, 300), max_pixels=None):
+    """
+    Resizes an image and saves it to a path.
+
+    `image_content` may be raw bytes or a file object. The pixel count is
+    checked from the image header before any decoding, and JPEGs are decoded
+    directly at a reduced scale close to the thumbnail size.
+    """
     path = Path(save_path)
-    image = Image.open(BytesIO(image_content))
-    image.thumbnail(thumbnail_size)
-    
-    # Ensure it saves as JPEG and handle RGB conversion
-    image.convert("RGB").save(path, format="JPEG")
+    source = BytesIO(image_content) if isinstance(image_content, (bytes, bytearray)) else image_content
+
+    with Image.open(source) as image:
+        width, height = image.size
+        if max_pixels and width * height > max_pixels:
+            raise ImageTooLargeError(f"Image is {width}x{height} pixels, limit is {max_pixels}")
+
+        image.draft("RGB", thumbnail_size)
+        image.thumbnail(thumbnail_size)
+
+        # Ensure it saves as JPEG and handle RGB conversion
+        image.convert("RGB").save(path, format="JPEG")
     return path.name
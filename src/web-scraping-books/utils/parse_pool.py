@@ -0,0 +1,35 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+class ParsePool:
+    """
+    Process pool that parses HTML and returns only the extracted records.
+
+    Workers receive raw HTML bytes and a picklable extractor (a module-level
+    function or an object such as `SchemaExtractor`) and send back the small
+    list of dictionaries it returns, never the parsed tree. Parsing then
+    runs on all cores instead of holding the GIL in the scraping process.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def submit(self, html, extractor):
+        """Schedules `extractor(html)` in a worker and returns its future."""
+        return self.executor.submit(extractor, html)
+
+    def map(self, pages, extractor):
+        """Extracts records from every page, yielding one list per page in order."""
+        futures = [self.submit(html, extractor) for html in pages]
+        for future in futures:
+            yield future.result()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
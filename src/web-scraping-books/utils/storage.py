@@ -0,0 +1,136 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from utils.file_utils import save_json_file
+
+BOOK_FIELDS = (
+    'title',
+    'rating',
+    'description',
+    'original_image_url',
+    'thumbnail_image',
+    'buy_link',
+    'last_update_date',
+)
+
+class BookStore(ABC):
+    """Base class for book storage backends."""
+
+    @abstractmethod
+    def upsert_many(self, books):
+        """Inserts or updates the given books, keyed on `Book.key`."""
+
+    @abstractmethod
+    def export_json(self, file_path):
+        """Writes every stored book to a JSON file in the books.json format."""
+
+    def close(self):
+        """Releases any resources held by the store."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class SqliteBookStore(BookStore):
+    """
+    Stores books in a SQLite database.
+
+    Rows are upserted in batched transactions keyed on `Book.key`, the
+    columns used for lookups are indexed, and the database runs in WAL mode
+    so readers are not blocked while the scraper writes. The connection may
+    be used from several threads; a lock serializes access to it.
+    """
+
+    def __init__(self, db_path, batch_size=500):
+        self.db_path = str(db_path)
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._create_schema()
+
+    def _create_schema(self):
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            self.connection.execute(
+                '''
+                CREATE TABLE IF NOT EXISTS books (
+                    book_key TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    rating TEXT,
+                    description TEXT,
+                    original_image_url TEXT,
+                    thumbnail_image TEXT,
+                    buy_link TEXT,
+                    last_update_date TEXT
+                )
+                '''
+            )
+            self.connection.execute('CREATE INDEX IF NOT EXISTS idx_books_title ON books (title)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS idx_books_buy_link ON books (buy_link)')
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_books_last_update_date ON books (last_update_date)'
+            )
+
+    def upsert_many(self, books):
+        columns = ', '.join(BOOK_FIELDS)
+        placeholders = ', '.join('?' for _ in range(len(BOOK_FIELDS) + 1))
+        updates = ', '.join(f'{field} = excluded.{field}' for field in BOOK_FIELDS)
+        statement = (
+            f'INSERT INTO books (book_key, {columns}) VALUES ({placeholders}) '
+            f'ON CONFLICT (book_key) DO UPDATE SET {updates}'
+        )
+
+        batch = []
+        for book in books:
+            data = book.to_dict()
+            batch.append((book.key, *(data[field] for field in BOOK_FIELDS)))
+            if len(batch) >= self.batch_size:
+                self._write_batch(statement, batch)
+                batch = []
+        if batch:
+            self._write_batch(statement, batch)
+
+    def _write_batch(self, statement, batch):
+        with self._lock, self.connection:
+            self.connection.executemany(statement, batch)
+
+    def get(self, book_key):
+        """Returns the stored book dictionary for a key, or None."""
+        with self._lock:
+            row = self.connection.execute(
+                f'SELECT {", ".join(BOOK_FIELDS)} FROM books WHERE book_key = ?', (book_key,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def find_by_title(self, title):
+        """Returns the stored books with an exact title match."""
+        return self._select('WHERE title = ?', (title,))
+
+    def find_by_buy_link(self, buy_link):
+        """Returns the stored books with an exact buy link match."""
+        return self._select('WHERE buy_link = ?', (buy_link,))
+
+    def all(self):
+        """Returns every stored book, ordered by title."""
+        return self._select('ORDER BY title')
+
+    def _select(self, clause, params=()):
+        with self._lock:
+            rows = self.connection.execute(
+                f'SELECT {", ".join(BOOK_FIELDS)} FROM books {clause}', params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def export_json(self, file_path):
+        save_json_file(self.all(), file_path=file_path)
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def __str__(self):
+        return self.db_path
@@ -0,0 +1,101 @@
+import codecs
+from html.parser import HTMLParser
+import requests
+from bs4 import BeautifulSoup
+from utils.data_extractors import BOOK_CONTAINER_CLASS, extract_book_raw_data
+
+CHUNK_SIZE = 64 * 1024
+
+class ContainerStreamParser(HTMLParser):
+    """
+    Incremental parser that cuts matching containers out of an HTML stream.
+
+    Feed it text in arbitrary chunks; every `<tag class="class_name">`
+    element is reassembled as an HTML fragment and becomes available from
+    `pop_completed()` as soon as its closing tag is seen. Nothing outside
+    the containers is kept, so memory does not grow with the page size.
+    """
+
+    def __init__(self, tag='div', class_name=BOOK_CONTAINER_CLASS):
+        # Keep entities as written so fragments round-trip unchanged
+        super().__init__(convert_charrefs=False)
+        self.tag = tag
+        self.class_name = class_name
+        self.depth = 0
+        self.parts = []
+        self.completed = []
+
+    def _matches(self, tag, attrs):
+        if tag != self.tag:
+            return False
+        classes = dict(attrs).get('class') or ''
+        return self.class_name in classes.split()
+
+    def handle_starttag(self, tag, attrs):
+        if self.depth:
+            self.parts.append(self.get_starttag_text())
+            if tag == self.tag:
+                self.depth += 1
+        elif self._matches(tag, attrs):
+            self.depth = 1
+            self.parts = [self.get_starttag_text()]
+
+    def handle_startendtag(self, tag, attrs):
+        if self.depth:
+            self.parts.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if not self.depth:
+            return
+        self.parts.append(f'</{tag}>')
+        if tag == self.tag:
+            self.depth -= 1
+            if not self.depth:
+                self.completed.append(''.join(self.parts))
+                self.parts = []
+
+    def handle_data(self, data):
+        if self.depth:
+            self.parts.append(data)
+
+    def handle_entityref(self, name):
+        if self.depth:
+            self.parts.append(f'&{name};')
+
+    def handle_charref(self, name):
+        if self.depth:
+            self.parts.append(f'&#{name};')
+
+    def pop_completed(self):
+        """Returns and clears the containers completed so far."""
+        completed, self.completed = self.completed, []
+        return completed
+
+def iter_containers(chunks, tag='div', class_name=BOOK_CONTAINER_CLASS):
+    """Yields each matching container fragment from an iterable of text chunks."""
+    parser = ContainerStreamParser(tag, class_name)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.pop_completed()
+    parser.close()
+    yield from parser.pop_completed()
+
+def iter_book_records(url, timeout=30, session=None):
+    """
+    Streams a listing page and yields the raw data of each book as soon as
+    its container has been received, without building the page's DOM.
+    """
+    with (session or requests).get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        # requests assumes ISO-8859-1 when no charset is declared; pages are UTF-8 in practice
+        declared = 'charset' in response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if declared and response.encoding else 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+        def text_chunks():
+            for chunk in response.iter_content(CHUNK_SIZE):
+                yield decoder.decode(chunk)
+            yield decoder.decode(b'', final=True)
+
+        for fragment in iter_containers(text_chunks()):
+            yield extract_book_raw_data(BeautifulSoup(fragment, 'html.parser'))
@@ -1,11 +1,232 @@
+import json
+import math
+import threading
 import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
 
-class Timer:
-    def __enter__(self):
-        self.start_time = time.time()
-        return self
+# Latency histogram buckets grow by 10% each, giving percentiles within ~5% of the true value
+_BUCKET_GROWTH = 1.1
+_LOG_BUCKET_GROWTH = math.log(_BUCKET_GROWTH)
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        self.end_time = time.time()
-        elapsed_time = self.end_time - self.start_time
-        print(f"Took: {elapsed_time:.2f} seconds")
+class StageStats:
+    """Aggregated timings for a single named stage."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.peak_memory = None
+        self.buckets = {}
+
+    def record(self, elapsed_ns, failed=False, peak_memory=None):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if failed:
+            self.errors += 1
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if peak_memory is not None and (self.peak_memory is None or peak_memory > self.peak_memory):
+            self.peak_memory = peak_memory
+        bucket = int(math.log(elapsed_ns) / _LOG_BUCKET_GROWTH) if elapsed_ns > 1 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, percent):
+        """Estimates the given latency percentile in nanoseconds from the histogram."""
+        if not self.count:
+            return 0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                upper = int(_BUCKET_GROWTH ** (bucket + 1))
+                return max(self.min_ns, min(upper, self.max_ns))
+        return self.max_ns
+
+    def to_dict(self):
+        return {
+            'stage': self.path,
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': self.total_ns / 1e6,
+            'mean_ms': self.total_ns / self.count / 1e6 if self.count else 0.0,
+            'min_ms': (self.min_ns or 0) / 1e6,
+            'p50_ms': self.percentile(50) / 1e6,
+            'p95_ms': self.percentile(95) / 1e6,
+            'p99_ms': self.percentile(99) / 1e6,
+            'max_ms': self.max_ns / 1e6,
+            'peak_memory_bytes': self.peak_memory,
+        }
+
+class _Frame:
+    __slots__ = ('path', 'start_ns', 'start_memory', 'child_peak')
+
+    def __init__(self, path, start_ns, start_memory):
+        self.path = path
+        self.start_ns = start_ns
+        self.start_memory = start_memory
+        self.child_peak = 0
+
+class Profiler:
+    """
+    Hierarchical stage profiler based on `time.perf_counter_ns`.
+
+    Stages nest per thread, so a `fetch` stage opened inside `scrape` is
+    reported as `scrape/fetch`. With `trace_memory=True`, the peak traced
+    memory of each stage is captured through `tracemalloc`; the tracing is
+    process-wide, so stages running concurrently see each other's allocations.
+    """
+
+    def __init__(self, trace_memory=False, enabled=True):
+        self.trace_memory = trace_memory
+        self.enabled = enabled
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name):
+        stack = self._stack()
+        path = f'{stack[-1].path}/{name}' if stack else name
+        if path not in self.stats:
+            # Registered on entry so the report lists stages in the order they were first entered
+            with self._lock:
+                if path not in self.stats:
+                    self.stats[path] = StageStats(path)
+        start_memory = None
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Keep the parent's peak so far before resetting it for this stage
+                parent = stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            start_memory = current
+        frame = _Frame(path, time.perf_counter_ns(), start_memory)
+        stack.append(frame)
+        return frame
+
+    def _exit(self, frame, failed):
+        elapsed_ns = time.perf_counter_ns() - frame.start_ns
+        stack = self._stack()
+        stack.pop()
+        peak_memory = None
+        if frame.start_memory is not None:
+            peak = max(tracemalloc.get_traced_memory()[1], frame.child_peak)
+            peak_memory = max(peak - frame.start_memory, 0)
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        with self._lock:
+            stats = self.stats.get(frame.path)
+            if stats is None:
+                stats = self.stats[frame.path] = StageStats(frame.path)
+            stats.record(elapsed_ns, failed, peak_memory)
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager that times the enclosed block as a named stage."""
+        if not self.enabled:
+            yield
+            return
+        frame = self._enter(name)
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self._exit(frame, failed)
+
+    def profile(self, name=None):
+        """Decorator that times every call of the function as a named stage."""
+        def decorator(func):
+            stage_name = name or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        """Discards all recorded stages."""
+        with self._lock:
+            self.stats = {}
+
+    def stop(self):
+        """Stops tracemalloc if this profiler started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def report(self):
+        """
+        Returns the recorded stages as a list of dictionaries, in the order
+        they were first entered (so a stage comes before its sub-stages).
+        """
+        with self._lock:
+            stats = [stage for stage in self.stats.values() if stage.count]
+            return [stage.to_dict() for stage in stats]
+
+    def to_json(self, file_path=None):
+        """Returns the report as JSON, optionally also writing it to a file."""
+        data = json.dumps({'stages': self.report()}, indent=4)
+        if file_path:
+            with open(file_path, 'w', encoding='utf-8') as json_file:
+                json_file.write(data)
+        return data
+
+    def format_table(self):
+        """Returns the report as a human-readable table."""
+        rows = self.report()
+        if not rows:
+            return "No stages recorded."
+
+        show_memory = any(row['peak_memory_bytes'] is not None for row in rows)
+        headers = ['stage', 'count', 'errors', 'total ms', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms']
+        if show_memory:
+            headers.append('peak KiB')
+
+        lines = []
+        for row in rows:
+            depth = row['stage'].count('/')
+            line = [
+                '  ' * depth + row['stage'].rsplit('/', 1)[-1],
+                str(row['count']),
+                str(row['errors']),
+                f"{row['total_ms']:.1f}",
+                f"{row['p50_ms']:.2f}",
+                f"{row['p95_ms']:.2f}",
+                f"{row['p99_ms']:.2f}",
+                f"{row['max_ms']:.2f}",
+            ]
+            if show_memory:
+                peak = row['peak_memory_bytes']
+                line.append(f"{peak / 1024:.1f}" if peak is not None else '-')
+            lines.append(line)
+
+        widths = [max(len(cell) for cell in column) for column in zip(headers, *lines)]
+        def format_line(cells):
+            first = cells[0].ljust(widths[0])
+            rest = (cell.rjust(width) for cell, width in zip(cells[1:], widths[1:]))
+            return '  '.join([first, *rest])
+
+        output = [format_line(headers), '  '.join('-' * width for width in widths)]
+        output.extend(format_line(line) for line in lines)
+        return '\n'.join(output)
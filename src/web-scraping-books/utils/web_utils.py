@@ -1,16 +1,34 @@
 import requests
 from bs4 import BeautifulSoup
 
-def fetch_html_content(url):
+def fetch_html_content(url, timeout=30, session=None):
     """
     Fetch the HTML content of a given URL.
 
     Parameters:
     url (str): The URL to fetch the HTML content from.
+    timeout (float): Seconds to wait for the server before giving up.
+    session (requests.Session): Optional session, to reuse open connections.
 
     Returns:
     BeautifulSoup: Parsed HTML content.
     """
-    response = requests.get(url)
+    response = (session or requests).get(url, timeout=timeout)
     html = response.content
     return BeautifulSoup(html, 'html.parser')
+
+def fetch_html_bytes(url, timeout=30, session=None):
+    """
+    Fetch the raw HTML of a given URL without parsing it.
+
+    Parameters:
+    url (str): The URL to fetch the HTML content from.
+    timeout (float): Seconds to wait for the server before giving up.
+    session (requests.Session): Optional session, to reuse open connections.
+
+    Returns:
+    bytes: The response body.
+    """
+    response = (session or requests).get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
@@ -0,0 +1,21 @@
+from fastfingertips.cache_utils import memoize
+
+
+def test_keyword_call_does_not_collide_with_positional_tuples():
+    @memoize()
+    def echo(*args, **kwargs):
+        return args, kwargs
+
+    assert echo(1, x=2) == ((1,), {"x": 2})
+    assert echo((1,), (("x", 2),)) == (((1,), (("x", 2),)), {})
+    assert echo.cache_info().misses == 2
+
+
+def test_keyword_order_shares_one_entry():
+    @memoize()
+    def add(a=0, b=0):
+        return a + b
+
+    assert add(a=1, b=2) == 3
+    assert add(b=2, a=1) == 3
+    assert add.cache_info().hits == 1
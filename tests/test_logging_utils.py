@@ -0,0 +1,33 @@
+import logging
+import queue
+
+from fastfingertips.logging_utils import BatchingQueueListener, setup_logger, shutdown_logger
+
+
+def test_queued_logger_writes_every_record_by_shutdown(tmp_path):
+    log_file = tmp_path / "app.log"
+    logger = setup_logger("test_queued", str(log_file), queued=True, batch_size=8, block=True)
+    for i in range(100):
+        logger.info("record %d", i)
+    shutdown_logger("test_queued")
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert [line.rsplit(" ", 1)[1] for line in lines] == [str(i) for i in range(100)]
+    assert not logger.handlers
+
+
+def test_listener_respects_handler_level():
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    log_queue = queue.Queue()
+    listener = BatchingQueueListener(log_queue, ListHandler(logging.WARNING))
+    listener.start()
+    for level, msg in [(logging.INFO, "dropped"), (logging.WARNING, "kept")]:
+        log_queue.put(logging.LogRecord("test", level, __file__, 0, msg, None, None))
+    listener.stop()
+
+    assert records == ["kept"]